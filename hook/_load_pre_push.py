@@ -0,0 +1,42 @@
+"""
+_load_pre_push.py — shared loader for the hook test scripts.
+
+pre-push.py contains a hyphen, so it cannot be imported by name. This
+module executes it once per interpreter and registers it in
+``sys.modules`` as ``pre_push``; every test script that runs in the same
+process then shares that one module object.
+
+Usage (from a script in hook/): ``from _load_pre_push import pre_push``
+"""
+from __future__ import annotations
+
+import importlib.util
+import os
+import sys
+from types import ModuleType
+
+_MODULE_NAME = "pre_push"
+_HOOK_PATH = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "pre-push.py",
+)
+
+
+def _load_once() -> ModuleType:
+    """Return the cached hook module, executing pre-push.py on first use."""
+    cached = sys.modules.get(_MODULE_NAME)
+    if cached is not None:
+        return cached
+
+    spec = importlib.util.spec_from_file_location(_MODULE_NAME, _HOOK_PATH)
+    assert spec is not None and spec.loader is not None
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[_MODULE_NAME] = module
+    try:
+        spec.loader.exec_module(module)
+    except BaseException:
+        del sys.modules[_MODULE_NAME]
+        raise
+    return module
+
+
+pre_push = _load_once()
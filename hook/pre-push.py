@@ -12,18 +12,35 @@ Execution order: startup → Check 1 → Check 2 → Check 5 → Check 6 → Che
 from __future__ import annotations
 
 import ast
+import bisect
+import collections
+import functools
+import itertools
 import json
 import os
+import re
 import subprocess
 import sys
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Set, Tuple
+from typing import (
+    AbstractSet, Any, Collection, Counter, Dict, FrozenSet, Iterable, List,
+    Optional, Set, Tuple, Union,
+)
 
 # ── Module-level constants ──────────────────────────────────────────
 HIGH_FAN_IN_THRESHOLD: int = 3
 PROPOSAL_ID_FORMAT: str = "prop_{date}_{agent_id}_{seq:03d}"
+# Above this many Queue + State entries, knowledge.json is written compact.
+KNOWLEDGE_COMPACT_MIN_ENTRIES: int = 2000
+PARALLEL_ENV_VAR: str = "SKL_HOOK_PARALLEL"
+PARALLEL_MAX_WORKERS: int = 8
+# Parsed trees are only reused within one file's analysis (base + head per
+# file in flight), so the AST memo tables hold at most two per worker.
+AST_CACHE_SIZE: int = min(2 * PARALLEL_MAX_WORKERS, 16)
 
 # ── Hardcoded defaults matching DEFAULT_HOOK_CONFIG ─────────────────
 
@@ -75,9 +92,10 @@ def find_repo_root(start: str) -> Optional[str]:
 def read_json_file(path: str) -> Optional[Any]:
     """Read and parse a JSON file, returning None on any failure."""
     try:
-        with open(path, "r", encoding="utf-8") as f:
-            return json.load(f)
-    except (OSError, json.JSONDecodeError):
+        # json.loads detects the UTF encoding of raw bytes itself;
+        # ValueError covers both JSONDecodeError and UnicodeDecodeError.
+        return json.loads(Path(path).read_bytes())
+    except (OSError, ValueError):
         return None
 
 
@@ -94,39 +112,80 @@ def load_hook_config(skl_dir: str) -> Dict[str, Any]:
 
 # ── Check 1: File Scope Validation ──────────────────────────────────
 
-def get_modified_files(repo_root: str, base_branch: str) -> Optional[List[str]]:
+def get_modified_files(
+    repo_root: str,
+    base_branch: str,
+    head_oids: Optional[Dict[str, Optional[str]]] = None,
+) -> Optional[List[str]]:
     """
     Return the list of files modified between *base_branch* and HEAD,
     as repo-relative paths. Returns None if git diff fails.
+
+    Rename detection is skipped — it is costly on large histories, and a
+    rename is still reported as its old and new paths. Submodule pointer
+    bumps are reported like any other path. ``-z`` keeps paths unquoted
+    and newline-safe; the raw bytes are split first and each path
+    decoded with ``os.fsdecode``.
+
+    When *head_oids* is given, the same diff runs in ``--raw`` form and
+    the dict is filled with each path's HEAD blob OID (``None`` for
+    deletions), so Check 3 can fetch HEAD content without resolving
+    ``HEAD:<path>`` again.
     """
+    fmt = ["--raw", "--no-abbrev"] if head_oids is not None else ["--name-only"]
     try:
         result = subprocess.run(
-            ["git", "diff", "--name-only", f"{base_branch}...HEAD"],
+            [
+                "git", "diff", *fmt, "--no-renames", "-z",
+                f"{base_branch}...HEAD",
+            ],
             capture_output=True,
-            text=True,
             cwd=repo_root,
         )
         if result.returncode != 0:
             return None
-        files = [f for f in result.stdout.strip().splitlines() if f]
-        return files
     except (OSError, subprocess.SubprocessError):
         return None
 
+    fields = result.stdout.split(b"\0")
+    if head_oids is None:
+        return [os.fsdecode(f) for f in fields if f]
+
+    # --raw -z: ":<mode> <mode> <src-oid> <dst-oid> <status>\0<path>\0"
+    files: List[str] = []
+    for meta, raw_path in zip(fields[0::2], fields[1::2]):
+        meta_parts = meta.split()
+        if not raw_path or len(meta_parts) < 4:
+            continue
+        path = os.fsdecode(raw_path)
+        dst_oid = meta_parts[3]
+        # An all-zero destination OID means the path is gone at HEAD.
+        head_oids[path] = (
+            dst_oid.decode("ascii") if dst_oid.strip(b"0") else None
+        )
+        files.append(path)
+    return files
+
 
 def check_file_scope(
     modified_files: List[str],
-    file_scope: List[str],
+    file_scope: Collection[str],
 ) -> Dict[str, FileViolation]:
     """
     Check 1 — compare modified files against the agent's file_scope.
 
     Returns a dict of path → FileViolation for *every* modified file.
-    Files not in file_scope have out_of_scope set to True.
+    Files not in file_scope have out_of_scope set to True. A set or
+    frozenset *file_scope* is used for lookups as-is.
     """
-    scope_set = set(file_scope)
     violations: Dict[str, FileViolation] = {}
 
+    scope_set: AbstractSet[str] = (
+        file_scope
+        if isinstance(file_scope, (set, frozenset))
+        else frozenset(file_scope)
+    )
+
     for path in modified_files:
         v = FileViolation(path)
         if path not in scope_set:
@@ -138,6 +197,35 @@ def check_file_scope(
 
 # ── Check 2: Semantic Scope Validation ──────────────────────────────
 
+class _PrefixSet:
+    """
+    Sorted, prefix-free view of a path-prefix list.
+
+    Any prefix that extends another is dropped (the shorter one already
+    matches everything it would). In a prefix-free sorted list, the only
+    candidate for a path is the greatest entry ``<=`` it, so each test
+    is one ``bisect`` plus one ``startswith``.
+    """
+
+    __slots__ = ("_prefixes",)
+
+    def __init__(self, prefixes: Iterable[str]) -> None:
+        minimal: List[str] = []
+        for prefix in sorted(set(prefixes)):
+            if minimal and prefix.startswith(minimal[-1]):
+                continue
+            minimal.append(prefix)
+        self._prefixes = minimal
+
+    def __bool__(self) -> bool:
+        return bool(self._prefixes)
+
+    def matches(self, path: str) -> bool:
+        """True if *path* starts with any of the prefixes."""
+        i = bisect.bisect_right(self._prefixes, path)
+        return i > 0 and path.startswith(self._prefixes[i - 1])
+
+
 def check_semantic_scope(
     violations: Dict[str, FileViolation],
     scope_entry: Optional[Dict[str, Any]],
@@ -162,6 +250,8 @@ def check_semantic_scope(
     forbidden_prefixes: List[str] = scope_entry.get("forbidden_path_prefixes") or []
 
     allowed_set = set(allowed_paths)
+    allowed_prefix_set = _PrefixSet(allowed_prefixes)
+    forbidden_prefix_set = _PrefixSet(forbidden_prefixes)
 
     for path, v in violations.items():
         # 1. Exact allowed path match
@@ -169,11 +259,11 @@ def check_semantic_scope(
             continue
 
         # 2. Allowed prefix match
-        if any(path.startswith(prefix) for prefix in allowed_prefixes):
+        if allowed_prefix_set and allowed_prefix_set.matches(path):
             continue
 
         # 3. Forbidden prefix match
-        if any(path.startswith(prefix) for prefix in forbidden_prefixes):
+        if forbidden_prefix_set and forbidden_prefix_set.matches(path):
             v.cross_scope_flag = True
 
     return violations
@@ -189,12 +279,16 @@ def check_queue_budget(
     Check 5 — count pending proposals in the queue.
 
     Returns an error message string if the queue is full, or None if OK.
+    Counting stops as soon as *queue_max* pending proposals are seen.
     """
     queue = knowledge.get("queue", [])
-    pending_count = sum(
-        1 for p in queue
-        if isinstance(p, dict) and p.get("status") == "pending"
-    )
+    pending_count = 0
+    if queue_max > 0:
+        for p in queue:
+            if isinstance(p, dict) and p.get("status") == "pending":
+                pending_count += 1
+                if pending_count >= queue_max:
+                    break
     if pending_count >= queue_max:
         return (
             f"SKL: Queue is full ({pending_count}/{queue_max} pending proposals). "
@@ -203,6 +297,58 @@ def check_queue_budget(
     return None
 
 
+# ── Queue index (shared by Checks 6 and 7) ─────────────────────────
+
+def index_queue(knowledge: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+    """Build a ``proposal_id → proposal`` lookup over the Queue."""
+    queue: List[Dict[str, Any]] = knowledge.get("queue", [])
+    return {
+        p["proposal_id"]: p
+        for p in queue
+        if isinstance(p, dict) and "proposal_id" in p
+    }
+
+
+# ── RFC loading (shared by Checks 6 and 7) ─────────────────────────
+
+def load_all_rfcs(rfcs_dir: str) -> List[Tuple[str, Dict[str, Any]]]:
+    """
+    Load every ``*.json`` RFC in *rfcs_dir* once, as ``(path, rfc)`` pairs
+    sorted by filename. ``DirEntry`` type information filters out
+    non-regular entries without an extra ``stat`` per file.
+
+    Files that cannot be read or parsed are reported on stderr and skipped.
+    A missing directory yields an empty list.
+    """
+    try:
+        with os.scandir(rfcs_dir) as it:
+            entries = sorted(
+                (e for e in it if e.name.endswith(".json") and e.is_file()),
+                key=lambda e: e.name,
+            )
+    except OSError:
+        return []
+
+    rfcs: List[Tuple[str, Dict[str, Any]]] = []
+    for entry in entries:
+        try:
+            rfc = json.loads(Path(entry.path).read_bytes())
+        except (OSError, ValueError) as exc:
+            print(
+                f"SKL: Warning — could not parse RFC file {entry.path}: {exc}",
+                file=sys.stderr,
+            )
+            continue
+        if not isinstance(rfc, dict):
+            print(
+                f"SKL: Warning — RFC file {entry.path} is not a JSON object.",
+                file=sys.stderr,
+            )
+            continue
+        rfcs.append((entry.path, rfc))
+    return rfcs
+
+
 # ── Check 6: Acceptance Criteria Gate ─────────────────────────────
 
 def check_acceptance_criteria(
@@ -210,6 +356,8 @@ def check_acceptance_criteria(
     agent_context: Dict[str, Any],
     current_branch: str,
     rfcs_dir: str,
+    rfcs: Optional[List[Tuple[str, Dict[str, Any]]]] = None,
+    queue_by_id: Optional[Dict[str, Dict[str, Any]]] = None,
 ) -> bool:
     """
     Check 6 — block push when the current branch is linked to an RFC
@@ -219,38 +367,20 @@ def check_acceptance_criteria(
     field from the Queue. Returns True (allow push) if no applicable
     RFC has unmet criteria; False (block push) otherwise.
 
-    *rfcs_dir* is the path to the .skl/rfcs/ directory.
+    *rfcs_dir* is the path to the .skl/rfcs/ directory. Pass *rfcs* (from
+    :func:`load_all_rfcs`) and *queue_by_id* (from :func:`index_queue`) to
+    reuse data already loaded for this push.
     """
+    if rfcs is None:
+        rfcs = load_all_rfcs(rfcs_dir)
     # If the rfcs directory is absent or empty, nothing to check.
-    if not os.path.isdir(rfcs_dir):
-        return True
-
-    rfc_files = [
-        os.path.join(rfcs_dir, f)
-        for f in os.listdir(rfcs_dir)
-        if f.endswith(".json")
-    ]
-    if not rfc_files:
+    if not rfcs:
         return True
 
-    # Build a lookup of proposal_id → proposal from the queue.
-    queue: List[Dict[str, Any]] = knowledge.get("queue", [])
-    queue_by_id: Dict[str, Dict[str, Any]] = {
-        p["proposal_id"]: p
-        for p in queue
-        if isinstance(p, dict) and "proposal_id" in p
-    }
+    if queue_by_id is None:
+        queue_by_id = index_queue(knowledge)
 
-    for rfc_path in rfc_files:
-        try:
-            with open(rfc_path, "r", encoding="utf-8") as fh:
-                rfc = json.load(fh)
-        except (OSError, json.JSONDecodeError) as exc:
-            print(
-                f"SKL: Warning — could not parse RFC file {rfc_path}: {exc}",
-                file=sys.stderr,
-            )
-            continue
+    for rfc_path, rfc in rfcs:
 
         # Only enforce when the flag is explicitly set.
         if rfc.get("merge_blocked_until_criteria_pass") is not True:
@@ -315,6 +445,8 @@ def check_rfc_scope_pause(
     knowledge: Dict[str, Any],
     agent_context: Dict[str, Any],
     rfcs_dir: str,
+    rfcs: Optional[List[Tuple[str, Dict[str, Any]]]] = None,
+    queue_by_id: Optional[Dict[str, Dict[str, Any]]] = None,
 ) -> bool:
     """
     Check 7 — block push when any open RFC whose human response deadline
@@ -322,40 +454,21 @@ def check_rfc_scope_pause(
     current agent.
 
     An expired deadline means the scope is paused until that RFC is
-    resolved. Uses UTC comparison for Python 3.8 compatibility.
+    resolved. Uses UTC comparison for Python 3.8 compatibility. Pass
+    *rfcs* and *queue_by_id* to reuse data already loaded for this push.
     """
-    if not os.path.isdir(rfcs_dir):
-        return True
-
-    rfc_files = [
-        os.path.join(rfcs_dir, f)
-        for f in os.listdir(rfcs_dir)
-        if f.endswith(".json")
-    ]
-    if not rfc_files:
+    if rfcs is None:
+        rfcs = load_all_rfcs(rfcs_dir)
+    if not rfcs:
         return True
 
-    # Build a lookup of proposal_id → proposal from the queue.
-    queue: List[Dict[str, Any]] = knowledge.get("queue", [])
-    queue_by_id: Dict[str, Dict[str, Any]] = {
-        p["proposal_id"]: p
-        for p in queue
-        if isinstance(p, dict) and "proposal_id" in p
-    }
+    if queue_by_id is None:
+        queue_by_id = index_queue(knowledge)
 
     agent_scope: str = agent_context.get("semantic_scope", "")
     now_utc = datetime.now(timezone.utc)
 
-    for rfc_path in rfc_files:
-        try:
-            with open(rfc_path, "r", encoding="utf-8") as fh:
-                rfc = json.load(fh)
-        except (OSError, json.JSONDecodeError) as exc:
-            print(
-                f"SKL: Warning — could not parse RFC file {rfc_path}: {exc}",
-                file=sys.stderr,
-            )
-            continue
+    for rfc_path, rfc in rfcs:
 
         # Only enforce on open RFCs.
         if rfc.get("status") != "open":
@@ -366,9 +479,11 @@ def check_rfc_scope_pause(
         if not raw_deadline:
             continue
         try:
-            deadline_dt = datetime.fromisoformat(
-                raw_deadline.replace("Z", "+00:00")
-            )
+            # Python < 3.11 fromisoformat rejects the "Z" UTC suffix.
+            iso = raw_deadline
+            if iso.endswith("Z"):
+                iso = iso[:-1] + "+00:00"
+            deadline_dt = datetime.fromisoformat(iso)
         except (ValueError, AttributeError):
             continue
 
@@ -406,20 +521,24 @@ def check_rfc_scope_pause(
 
 # ── Check 3 helpers: AST risk signal generation ─────────────────────
 
+# Python source as text or as raw blob bytes. ``ast.parse`` accepts both;
+# bytes let the tokenizer honour PEP 263 coding declarations itself.
+Source = Union[str, bytes]
+
+
 def get_file_content_at_ref(
     filepath: str, git_ref: str, repo_root: Optional[str] = None,
-) -> Optional[str]:
+) -> Optional[bytes]:
     """
     Retrieve the content of *filepath* at *git_ref* via ``git show``.
 
-    Returns the file content as a string, or ``None`` if the file did
-    not exist at that ref (new file).
+    Returns the raw blob bytes, or ``None`` if the file did not exist at
+    that ref (new file).
     """
     try:
         result = subprocess.run(
             ["git", "show", f"{git_ref}:{filepath}"],
             capture_output=True,
-            text=True,
             cwd=repo_root,
         )
         if result.returncode != 0:
@@ -429,20 +548,238 @@ def get_file_content_at_ref(
         return None
 
 
+class GitCatFileBatch:
+    """
+    Long-running ``git cat-file --batch`` reader for Check 3.
+
+    :meth:`prefetch` resolves a known set of lookups up front in one
+    pipelined round trip; :meth:`get` serves those from memory. Only a
+    lookup that was not prefetched starts the interactive child process,
+    which then answers every later miss in the push. Falls back to
+    :func:`get_file_content_at_ref` if the process cannot be started or
+    dies mid-stream. Lookups are serialized, so one instance may be
+    shared across threads.
+    """
+
+    def __init__(self, repo_root: Optional[str] = None) -> None:
+        self.repo_root = repo_root
+        self._lock = threading.Lock()
+        self._prefetched: Dict[str, Optional[bytes]] = {}
+        self._proc: Optional[subprocess.Popen] = None
+        self._started = False
+
+    def _child(self) -> Optional[subprocess.Popen]:
+        """Start the interactive child on first use; None if it is unavailable."""
+        if not self._started:
+            self._started = True
+            try:
+                self._proc = subprocess.Popen(
+                    ["git", "cat-file", "--batch"],
+                    stdin=subprocess.PIPE,
+                    stdout=subprocess.PIPE,
+                    stderr=subprocess.DEVNULL,
+                    cwd=self.repo_root,
+                )
+            except (OSError, subprocess.SubprocessError):
+                self._proc = None
+        return self._proc
+
+    def get(self, filepath: str, git_ref: str) -> Optional[bytes]:
+        """
+        Return the content of *filepath* at *git_ref*, or ``None`` if it
+        did not exist at that ref — same contract as
+        :func:`get_file_content_at_ref`.
+        """
+        # The batch protocol is newline-delimited; such paths use git show.
+        if "\n" not in filepath:
+            with self._lock:
+                object_name = f"{git_ref}:{filepath}"
+                if object_name in self._prefetched:
+                    return self._prefetched.pop(object_name)
+                if self._child() is not None:
+                    try:
+                        return self._request(object_name)
+                    except (OSError, ValueError):
+                        self.close()
+        return get_file_content_at_ref(filepath, git_ref, self.repo_root)
+
+    def prefetch(
+        self,
+        filepaths: Iterable[str],
+        git_refs: Iterable[str],
+        known_oids: Optional[Dict[str, Optional[str]]] = None,
+    ) -> None:
+        """
+        Fetch every ``<ref>:<path>`` pair from *git_refs* × *filepaths* in
+        a single ``git cat-file --batch`` run, writing all requests before
+        reading any reply. Pairs that cannot be prefetched are left for
+        :meth:`get` to resolve one at a time.
+
+        *known_oids* maps ``"<ref>:<path>"`` to an already-resolved blob
+        OID (``None`` = absent at that ref); those are requested by OID,
+        or not at all, instead of by path.
+        """
+        known = known_oids or {}
+        refs = list(git_refs)
+        names: List[str] = []
+        fetched: Dict[str, Optional[bytes]] = {}
+        for path in filepaths:
+            if "\n" in path:
+                continue
+            for ref in refs:
+                name = f"{ref}:{path}"
+                if name in known and known[name] is None:
+                    fetched[name] = None
+                else:
+                    names.append(name)
+
+        out = b""
+        if names:
+            requests = [known.get(n) or n for n in names]
+            try:
+                result = subprocess.run(
+                    ["git", "cat-file", "--batch"],
+                    input=b"".join(os.fsencode(r) + b"\n" for r in requests),
+                    capture_output=True,
+                    cwd=self.repo_root,
+                )
+                if result.returncode == 0:
+                    out = result.stdout
+            except (OSError, ValueError, subprocess.SubprocessError):
+                pass
+
+        fetched.update(self._parse_batch_reply(names, out))
+        with self._lock:
+            self._prefetched.update(fetched)
+
+    @staticmethod
+    def _parse_batch_reply(
+        names: List[str], out: bytes,
+    ) -> Dict[str, Optional[bytes]]:
+        """
+        Split a ``git cat-file --batch`` reply to *names* (in request
+        order) into ``name → blob bytes``; missing and non-blob objects
+        map to ``None``. Parsing stops at the first truncated reply, so
+        the names after it are left unresolved.
+        """
+        replies: Dict[str, Optional[bytes]] = {}
+        pos = 0
+        for name in names:
+            # Same framing as _request.
+            eol = out.find(b"\n", pos)
+            if eol < 0:
+                break
+            parts = out[pos:eol].split()
+            pos = eol + 1
+            if len(parts) != 3 or not parts[2].isdigit():
+                replies[name] = None
+                continue
+            size = int(parts[2])
+            if pos + size > len(out):
+                break
+            payload = out[pos:pos + size]
+            pos += size + 1  # trailing newline after each object
+            replies[name] = payload if parts[1] == b"blob" else None
+        return replies
+
+    def _request(self, object_name: str) -> Optional[bytes]:
+        assert self._proc is not None
+        assert self._proc.stdin is not None and self._proc.stdout is not None
+        self._proc.stdin.write(os.fsencode(object_name) + b"\n")
+        self._proc.stdin.flush()
+
+        # Header: "<oid> <type> <size>\n", or "<name> missing\n".
+        header = self._proc.stdout.readline()
+        if not header:
+            raise OSError("git cat-file --batch exited unexpectedly")
+        parts = header.split()
+        if len(parts) != 3 or not parts[2].isdigit():
+            return None
+        size = int(parts[2])
+        payload = self._proc.stdout.read(size)
+        self._proc.stdout.read(1)  # trailing newline after each object
+        if len(payload) != size:
+            raise OSError("git cat-file --batch returned a short read")
+        if parts[1] != b"blob":
+            return None
+        return payload
+
+    def close(self) -> None:
+        """Shut down the child process; later lookups use ``git show``."""
+        self._started = True
+        proc, self._proc = self._proc, None
+        if proc is None:
+            return
+        try:
+            if proc.stdin is not None:
+                proc.stdin.close()
+            proc.wait()
+        except OSError:
+            pass
+
+
 # ── Timing guard constant (milliseconds) ────────────────────────────
 _AST_TIMEOUT_MS = 500
+# The budget is measured in this thread's CPU time. Under SKL_HOOK_PARALLEL
+# the comparisons share the GIL, and wall-clock time would also count the
+# time a thread waits for it. Then mechanical_only would depend on
+# scheduling rather than on the file itself.
+_ast_clock = getattr(time, "thread_time", time.monotonic)
 
 
-def _safe_parse(source: str) -> Optional[ast.Module]:
-    """Parse Python source, returning None on any syntax error."""
+@functools.lru_cache(maxsize=AST_CACHE_SIZE)
+def _safe_parse(source: Source) -> Optional[ast.Module]:
+    """
+    Parse Python source, returning None on any syntax error.
+
+    Memoized on the source so the risk-signal helpers and the import
+    scan share one tree per file. Callers must treat the tree as read-only.
+    ``ValueError`` covers null bytes, which Python < 3.12 rejects that way.
+    """
     try:
         return ast.parse(source, type_comments=False)
-    except SyntaxError:
+    except (SyntaxError, ValueError):
         return None
 
 
+class _HeadAnalyzer:
+    """
+    Single-pass collector for the head-side facts used by Checks 3 and 4.
+
+    One ``ast.walk`` over the tree records imported module names, every
+    ``ast.Name.id`` and ``ast.Attribute.attr`` identifier, and the top-level
+    definitions. Call targets need no case of their own — ``ast.Call.func``
+    is itself a ``Name`` or ``Attribute`` node and is reached by the walk.
+
+    ``ast.walk`` is iterative, so deeply nested expressions that
+    ``ast.parse`` accepts cannot hit the recursion limit here.
+    """
+
+    def __init__(self, tree: ast.Module) -> None:
+        self.modules: List[str] = []
+        self.identifiers: Set[str] = set()
+        self.top_defs: Dict[str, ast.AST] = _extract_top_level_defs(tree)
+        for node in ast.walk(tree):
+            if isinstance(node, ast.Name):
+                self.identifiers.add(node.id)
+            elif isinstance(node, ast.Attribute):
+                self.identifiers.add(node.attr)
+            elif isinstance(node, ast.Import):
+                for alias in node.names:
+                    self.modules.append(alias.name)
+            elif isinstance(node, ast.ImportFrom):
+                if node.module is not None:
+                    self.modules.append(node.module)
+
+
+@functools.lru_cache(maxsize=AST_CACHE_SIZE)
+def _analyze_head(tree: ast.Module) -> _HeadAnalyzer:
+    """Run :class:`_HeadAnalyzer` over *tree* and return the collected facts."""
+    return _HeadAnalyzer(tree)
+
+
 def compute_mechanical_only(
-    base_content: Optional[str], head_content: str,
+    base_content: Optional[Source], head_content: Source,
 ) -> bool:
     """
     Check 3 helper — determine whether a diff is *mechanical-only*.
@@ -454,7 +791,7 @@ def compute_mechanical_only(
     Returns ``False`` as the safe default on parse failures, new files,
     or timeout (> 500 ms).
     """
-    t0 = time.monotonic()
+    t0 = _ast_clock()
 
     # New file is never mechanical.
     if base_content is None:
@@ -465,59 +802,109 @@ def compute_mechanical_only(
     if base_tree is None or head_tree is None:
         return False
 
-    # Strip cosmetic nodes (docstrings, bare constants, Pass) from
-    # every statement list in the tree so that dumps become comparable.
-    import copy as _copy
-
-    def _strip_cosmetic(tree: ast.Module) -> ast.Module:
-        """Return a deep copy with docstrings, bare Constants, and Pass removed."""
-        tree = _copy.deepcopy(tree)
-        for node in ast.walk(tree):
-            for field, value in ast.iter_fields(node):
-                if isinstance(value, list):
-                    filtered: List[ast.AST] = []
-                    for item in value:
-                        if isinstance(item, ast.Pass):
-                            continue
-                        if (
-                            isinstance(item, ast.Expr)
-                            and isinstance(
-                                getattr(item, "value", None), ast.Constant
-                            )
-                        ):
-                            continue
-                        filtered.append(item)
-                    setattr(node, field, filtered)
-        return tree
-
-    base_stripped = _strip_cosmetic(base_tree)
-    head_stripped = _strip_cosmetic(head_tree)
-
-    # Fast path: identical AST dumps after stripping.
-    if ast.dump(base_stripped) == ast.dump(head_stripped):
-        elapsed_ms = (time.monotonic() - t0) * 1000
-        if elapsed_ms > _AST_TIMEOUT_MS:
-            print(
-                f"SKL: Warning — AST mechanical-only check exceeded {_AST_TIMEOUT_MS}ms "
-                f"({elapsed_ms:.0f}ms). Defaulting to non-mechanical.",
-                file=sys.stderr,
-            )
-            return False
+    # Identical sources: nothing to compare.
+    if base_content == head_content:
         return True
 
-    base_nodes = ast.dump(base_stripped)
-    head_nodes = ast.dump(head_stripped)
+    return _mechanical_only(base_tree, head_tree, t0)
 
-    elapsed_ms = (time.monotonic() - t0) * 1000
-    if elapsed_ms > _AST_TIMEOUT_MS:
-        print(
-            f"SKL: Warning — AST mechanical-only check exceeded {_AST_TIMEOUT_MS}ms "
-            f"({elapsed_ms:.0f}ms). Defaulting to non-mechanical.",
-            file=sys.stderr,
-        )
+
+def _mechanical_only(
+    base_tree: ast.Module, head_tree: ast.Module, t0: float,
+) -> bool:
+    """
+    Compare two parsed trees for :func:`compute_mechanical_only`.
+
+    *t0* is the ``_ast_clock()`` reading taken before parsing so the
+    timeout budget covers the parse as well as the comparison.
+    """
+    deadline = t0 + _AST_TIMEOUT_MS / 1000
+    try:
+        equal = _ast_equal_ignoring_cosmetic(base_tree, head_tree, deadline)
+    except _ASTComparisonTimeout:
+        _warn_ast_timeout(t0)
+        return False
+
+    if _ast_clock() > deadline:
+        _warn_ast_timeout(t0)
         return False
+    return equal
+
+
+def _warn_ast_timeout(t0: float) -> None:
+    """Report that the mechanical-only check blew its time budget."""
+    elapsed_ms = (_ast_clock() - t0) * 1000
+    print(
+        f"SKL: Warning — AST mechanical-only check exceeded {_AST_TIMEOUT_MS}ms "
+        f"({elapsed_ms:.0f}ms). Defaulting to non-mechanical.",
+        file=sys.stderr,
+    )
+
+
+class _ASTComparisonTimeout(Exception):
+    """Raised when a structural AST comparison runs past its deadline."""
+
+
+# Node pairs compared between deadline checks in the structural comparison.
+_AST_DEADLINE_CHECK_INTERVAL = 256
+
+_MISSING = object()
+
+
+def _is_cosmetic(node: object) -> bool:
+    """True for ``pass`` and bare-constant expression statements (docstrings)."""
+    return isinstance(node, ast.Pass) or (
+        isinstance(node, ast.Expr) and isinstance(node.value, ast.Constant)
+    )
+
+
+def _ast_equal_ignoring_cosmetic(
+    a: ast.AST, b: ast.AST, deadline: float,
+) -> bool:
+    """
+    Compare two trees field by field, skipping cosmetic statements in every
+    list field without copying or serialising either tree.
+
+    Raises :class:`_ASTComparisonTimeout` once ``_ast_clock()`` passes
+    *deadline*; the clock is sampled every ``_AST_DEADLINE_CHECK_INTERVAL``
+    nodes.
+    """
+    visited = 0
 
-    return base_nodes == head_nodes
+    def _node_eq(x: ast.AST, y: ast.AST) -> bool:
+        nonlocal visited
+        if type(x) is not type(y):
+            return False
+        visited += 1
+        if (
+            visited % _AST_DEADLINE_CHECK_INTERVAL == 0
+            and _ast_clock() > deadline
+        ):
+            raise _ASTComparisonTimeout
+        for (_, x_val), (_, y_val) in zip(ast.iter_fields(x), ast.iter_fields(y)):
+            if isinstance(x_val, list):
+                if not isinstance(y_val, list):
+                    return False
+                pairs = itertools.zip_longest(
+                    (item for item in x_val if not _is_cosmetic(item)),
+                    (item for item in y_val if not _is_cosmetic(item)),
+                    fillvalue=_MISSING,
+                )
+                for x_item, y_item in pairs:
+                    if not _value_eq(x_item, y_item):
+                        return False
+            elif not _value_eq(x_val, y_val):
+                return False
+        return True
+
+    def _value_eq(x_val: Any, y_val: Any) -> bool:
+        if isinstance(x_val, ast.AST):
+            return isinstance(y_val, ast.AST) and _node_eq(x_val, y_val)
+        # Compare types too so that 1, 1.0 and True stay distinct, matching
+        # what an ast.dump comparison would report.
+        return type(x_val) is type(y_val) and x_val == y_val
+
+    return _node_eq(a, b)
 
 
 def _extract_top_level_defs(
@@ -531,40 +918,42 @@ def _extract_top_level_defs(
     return defs
 
 
-def _signature_key(node: ast.AST) -> Tuple[str, ...]:
+def _same_arg_names(a: List[ast.arg], b: List[ast.arg]) -> bool:
+    """True if two argument lists have the same names in the same order."""
+    if len(a) != len(b):
+        return False
+    return all(x.arg == y.arg for x, y in zip(a, b))
+
+
+def _same_signature(base: ast.AST, head: ast.AST) -> bool:
     """
-    Build a comparable signature tuple for a function or class node.
+    Compare the signatures of two same-named top-level definitions.
 
-    For functions: (name, arg_names..., has_vararg, has_kwarg, #defaults, #kw_defaults)
-    For classes:   (name,)
+    Functions match when their argument names, ``*args``/``**kwargs``
+    presence, number of defaults, keyword-only names and number of
+    keyword-only defaults all agree (sync vs async is not a change).
+    Classes match on name alone. A function never matches a class.
     """
-    if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
-        args_obj = node.args
-        arg_names = tuple(a.arg for a in args_obj.args)
-        has_vararg = "*" if args_obj.vararg else ""
-        has_kwarg = "**" if args_obj.kwarg else ""
-        n_defaults = str(len(args_obj.defaults))
-        kw_only_names = tuple(a.arg for a in args_obj.kwonlyargs)
-        n_kw_defaults = str(
-            sum(1 for d in args_obj.kw_defaults if d is not None)
-        )
+    func_types = (ast.FunctionDef, ast.AsyncFunctionDef)
+    if isinstance(base, func_types):
+        if not isinstance(head, func_types):
+            return False
+        a, b = base.args, head.args
         return (
-            node.name,
-            *arg_names,
-            has_vararg,
-            has_kwarg,
-            n_defaults,
-            *kw_only_names,
-            n_kw_defaults,
+            bool(a.vararg) == bool(b.vararg)
+            and bool(a.kwarg) == bool(b.kwarg)
+            and len(a.defaults) == len(b.defaults)
+            and _same_arg_names(a.args, b.args)
+            and _same_arg_names(a.kwonlyargs, b.kwonlyargs)
+            and sum(1 for d in a.kw_defaults if d is not None)
+            == sum(1 for d in b.kw_defaults if d is not None)
         )
     # ClassDef — only the name matters for this check.
-    if isinstance(node, ast.ClassDef):
-        return (node.name,)
-    return ()
+    return isinstance(base, ast.ClassDef) and isinstance(head, ast.ClassDef)
 
 
 def compute_public_api_signature_changed(
-    base_content: Optional[str], head_content: str,
+    base_content: Optional[Source], head_content: Source,
 ) -> bool:
     """
     Check 3 helper — determine whether the public API surface changed.
@@ -584,23 +973,33 @@ def compute_public_api_signature_changed(
     if base_tree is None or head_tree is None:
         return True
 
-    base_defs = _extract_top_level_defs(base_tree)
-    head_defs = _extract_top_level_defs(head_tree)
+    # Identical sources: nothing to compare.
+    if base_content == head_content:
+        return False
+
+    return _public_api_changed(
+        _extract_top_level_defs(base_tree), _extract_top_level_defs(head_tree),
+    )
+
 
+def _public_api_changed(
+    base_defs: Dict[str, ast.AST], head_defs: Dict[str, ast.AST],
+) -> bool:
+    """Compare two ``{name: def_node}`` maps for added/removed/changed defs."""
     # Check for added or removed names.
-    if set(base_defs.keys()) != set(head_defs.keys()):
+    if base_defs.keys() != head_defs.keys():
         return True
 
     # Check for signature changes on surviving names.
-    for name in base_defs:
-        if _signature_key(base_defs[name]) != _signature_key(head_defs[name]):
+    for name, base_node in base_defs.items():
+        if not _same_signature(base_node, head_defs[name]):
             return True
 
     return False
 
 
 def compute_auth_pattern_touched(
-    head_content: str, security_patterns: List[str],
+    head_content: Source, security_patterns: Collection[str],
 ) -> bool:
     """
     Check 3 helper — detect whether *head_content* references any of the
@@ -613,70 +1012,100 @@ def compute_auth_pattern_touched(
     Returns ``False`` on parse failure (safe default — caller cannot confirm
     a match).
     """
+    # Nothing can match an empty pattern list; skip the parse entirely.
+    if not security_patterns:
+        return False
+    # An identifier equal to a pattern must appear verbatim as a word in
+    # ASCII source. (Non-ASCII source is NFKC-normalized by the parser,
+    # so text matching could miss it — always parse those.) Raw bytes go
+    # straight to the parser, which owns their decoding.
+    if isinstance(head_content, str) and head_content.isascii():
+        prefilter = _security_prefilter(frozenset(security_patterns))
+        if prefilter.search(head_content) is None:
+            return False
     tree = _safe_parse(head_content)
     if tree is None:
         return False
+    return _auth_pattern_touched(_analyze_head(tree), security_patterns)
 
-    identifiers: List[str] = []
-    for node in ast.walk(tree):
-        if isinstance(node, ast.Name):
-            identifiers.append(node.id)
-        elif isinstance(node, ast.Attribute):
-            identifiers.append(node.attr)
-        elif isinstance(node, ast.Call):
-            func = node.func
-            if isinstance(func, ast.Name):
-                identifiers.append(func.id)
-            elif isinstance(func, ast.Attribute):
-                identifiers.append(func.attr)
-
-    for ident in identifiers:
-        for pattern in security_patterns:
-            if ident == pattern:
-                return True
-    return False
 
+@functools.lru_cache(maxsize=8)
+def _security_prefilter(security_patterns: FrozenSet[str]) -> re.Pattern:
+    """One word-bounded alternation over every security pattern."""
+    alternatives = "|".join(
+        re.escape(p) for p in sorted(security_patterns, key=len, reverse=True)
+    )
+    return re.compile(rf"(?<!\w)(?:{alternatives})(?!\w)")
+
+
+def _auth_pattern_touched(
+    analysis: _HeadAnalyzer, security_patterns: Iterable[str],
+) -> bool:
+    """True if any identifier collected by *analysis* is a security pattern."""
+    return not analysis.identifiers.isdisjoint(security_patterns)
 
+
+@functools.lru_cache(maxsize=8192)
 def _normalize_path(p: str) -> str:
     """Strip leading ``./`` and normalize separators."""
     return os.path.normpath(p)
 
 
+class StateDependencyIndex:
+    """
+    Reverse index over State ``dependencies``, built once per push.
+
+    * ``fan_in`` — normalized path → number of records depending on it
+      (each record counted once).
+    * ``invariant_deps`` — normalized paths depended on by at least one
+      record with non-empty ``invariants_touched``.
+    """
+
+    def __init__(self, state_records: List[Dict[str, Any]]) -> None:
+        self.fan_in: Counter[str] = collections.Counter()
+        self.invariant_deps: Set[str] = set()
+        for record in state_records:
+            deps = {_normalize_path(d) for d in record.get("dependencies", [])}
+            self.fan_in.update(deps)
+            if record.get("invariants_touched", []):
+                self.invariant_deps |= deps
+
+
+def index_state_dependencies(
+    state_records: List[Dict[str, Any]],
+) -> StateDependencyIndex:
+    """Build the Check 3 ``StateDependencyIndex`` for *state_records*."""
+    return StateDependencyIndex(state_records)
+
+
 def compute_invariant_referenced_file_modified(
     modified_filepath: str, state_records: List[Dict[str, Any]],
+    state_deps: Optional[StateDependencyIndex] = None,
 ) -> bool:
     """
     Check 3 helper — True if any State record with non-empty
     ``invariants_touched`` lists *modified_filepath* in its
     ``dependencies``.
+
+    *state_deps* is the ``index_state_dependencies`` result for
+    *state_records*; it is built here when not supplied.
     """
-    norm_modified = _normalize_path(modified_filepath)
-    for record in state_records:
-        invariants = record.get("invariants_touched", [])
-        if not invariants:
-            continue
-        deps = record.get("dependencies", [])
-        for dep in deps:
-            if _normalize_path(dep) == norm_modified:
-                return True
-    return False
+    if state_deps is None:
+        state_deps = index_state_dependencies(state_records)
+    return _normalize_path(modified_filepath) in state_deps.invariant_deps
 
 
 def compute_high_fan_in(
     modified_filepath: str, state_records: List[Dict[str, Any]],
+    state_deps: Optional[StateDependencyIndex] = None,
 ) -> bool:
     """
     Check 3 helper — True if *modified_filepath* appears in the
     ``dependencies`` of >= ``HIGH_FAN_IN_THRESHOLD`` State records.
     """
-    norm_modified = _normalize_path(modified_filepath)
-    count = 0
-    for record in state_records:
-        deps = record.get("dependencies", [])
-        for dep in deps:
-            if _normalize_path(dep) == norm_modified:
-                count += 1
-                break  # only count each record once
+    if state_deps is None:
+        state_deps = index_state_dependencies(state_records)
+    count = state_deps.fan_in[_normalize_path(modified_filepath)]
     return count >= HIGH_FAN_IN_THRESHOLD
 
 
@@ -698,21 +1127,52 @@ def derive_ast_change_type(
 
 
 def build_risk_signals(
-    base_content: Optional[str],
-    head_content: str,
+    base_content: Optional[Source],
+    head_content: Source,
     filepath: str,
     state_records: List[Dict[str, Any]],
-    security_patterns: List[str],
+    security_patterns: Iterable[str],
+    state_deps: Optional[StateDependencyIndex] = None,
 ) -> Dict[str, Any]:
     """
     Orchestrate all risk-signal computations and return the complete
     ``risk_signals`` dict matching the ``RiskSignals`` TypeScript type.
+
+    Pass *state_deps* (from ``index_state_dependencies``) to reuse one
+    normalized view of *state_records* across every modified file.
     """
-    mech = compute_mechanical_only(base_content, head_content)
-    pub_api = compute_public_api_signature_changed(base_content, head_content)
-    auth = compute_auth_pattern_touched(head_content, security_patterns)
-    inv_ref = compute_invariant_referenced_file_modified(filepath, state_records)
-    fan_in = compute_high_fan_in(filepath, state_records)
+    # Parse each side once and share the trees across every helper.
+    t0 = _ast_clock()
+    head_tree = _safe_parse(head_content)
+    base_tree = _safe_parse(base_content) if base_content is not None else None
+    head_analysis = _analyze_head(head_tree) if head_tree is not None else None
+
+    if base_tree is None or head_tree is None or head_analysis is None:
+        # New file or parse failure → the same safe defaults the
+        # standalone helpers return.
+        mech = False
+        pub_api = True
+    elif base_content == head_content:
+        # Identical sources (e.g. a file touched and restored on the
+        # branch) are trivially mechanical with an unchanged API.
+        mech = True
+        pub_api = False
+    else:
+        mech = _mechanical_only(base_tree, head_tree, t0)
+        pub_api = _public_api_changed(
+            _extract_top_level_defs(base_tree), head_analysis.top_defs,
+        )
+    auth = (
+        _auth_pattern_touched(head_analysis, security_patterns)
+        if head_analysis is not None
+        else False
+    )
+    if state_deps is None:
+        state_deps = index_state_dependencies(state_records)
+    inv_ref = compute_invariant_referenced_file_modified(
+        filepath, state_records, state_deps,
+    )
+    fan_in = compute_high_fan_in(filepath, state_records, state_deps)
     change_type = derive_ast_change_type(mech, pub_api)
 
     # mechanical_only is True only when ast_change_type == "mechanical"
@@ -734,7 +1194,32 @@ def build_risk_signals(
     }
 
 
-def extract_imports(head_content: str) -> List[str]:
+def _non_python_risk_signals(
+    filepath: str,
+    state_records: List[Dict[str, Any]],
+    state_deps: Optional[StateDependencyIndex] = None,
+) -> Dict[str, Any]:
+    """
+    ``risk_signals`` for a file Check 3 cannot parse as Python — the
+    same result ``build_risk_signals(None, "", ...)`` produces, without
+    any AST work. Only the State-record signals depend on *filepath*.
+    """
+    return {
+        "touched_auth_or_permission_patterns": False,
+        "public_api_signature_changed": True,
+        "invariant_referenced_file_modified":
+            compute_invariant_referenced_file_modified(
+                filepath, state_records, state_deps,
+            ),
+        "high_fan_in_module_modified": compute_high_fan_in(
+            filepath, state_records, state_deps,
+        ),
+        "ast_change_type": derive_ast_change_type(False, True),
+        "mechanical_only": False,
+    }
+
+
+def extract_imports(head_content: Source) -> List[str]:
     """
     Check 4 helper — extract all imported module names from *head_content*.
 
@@ -742,25 +1227,50 @@ def extract_imports(head_content: str) -> List[str]:
     * ``from app.utils import x``  → ``"app.utils"``
     * ``from . import x`` (relative, no module) → skipped
 
-    Returns an empty list on parse failure.
+    Returns an empty list on parse failure. Source that never spells the
+    ``import`` keyword cannot contain an import statement and is not
+    parsed at all.
     """
+    if isinstance(head_content, bytes):
+        if b"import" not in head_content:
+            return []
+    elif "import" not in head_content:
+        return []
     tree = _safe_parse(head_content)
     if tree is None:
         return []
+    # Copy: the analyzer is memoized, so its list must not leak to callers.
+    return list(_analyze_head(tree).modules)
+
 
-    modules: List[str] = []
-    for node in ast.walk(tree):
-        if isinstance(node, ast.Import):
-            for alias in node.names:
-                modules.append(alias.name)
-        elif isinstance(node, ast.ImportFrom):
-            if node.module is not None:
-                modules.append(node.module)
-    return modules
+def list_repo_paths(repo_root: str) -> Optional[FrozenSet[str]]:
+    """
+    Check 4 helper — every file path tracked at HEAD, as reported by one
+    ``git ls-tree -r`` call (``/``-separated). Returns None if git fails.
+
+    Membership in the set is case-sensitive, and ``ls-tree`` lists a
+    submodule as a single gitlink entry rather than its files. On a
+    case-insensitive filesystem, or for a module inside a submodule, a
+    lookup can miss here. :func:`resolve_to_repo_path` then falls back
+    to ``os.path.isfile``.
+    """
+    try:
+        result = subprocess.run(
+            ["git", "ls-tree", "-r", "-z", "--name-only", "HEAD"],
+            capture_output=True,
+            cwd=repo_root,
+        )
+        if result.returncode != 0:
+            return None
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return frozenset(os.fsdecode(p) for p in result.stdout.split(b"\0") if p)
 
 
+@functools.lru_cache(maxsize=4096)
 def resolve_to_repo_path(
     module_str: str, repo_root: str,
+    repo_paths: Optional[FrozenSet[str]] = None,
 ) -> Optional[str]:
     """
     Check 4 helper — convert a dotted Python module string to a
@@ -768,9 +1278,24 @@ def resolve_to_repo_path(
 
     Checks ``<module_as_path>.py`` first, then ``<module_as_path>/__init__.py``.
     Returns ``None`` when neither exists (stdlib / third-party).
+
+    With *repo_paths* (from :func:`list_repo_paths`) the candidates are
+    looked up in that set first. A miss there, or no set at all, checks
+    each candidate on disk with ``os.path.isfile``, which follows the
+    filesystem's case rules and sees into submodules.
+
+    Memoized per ``(module_str, repo_root, repo_paths)`` so a module
+    imported by many modified files is resolved once per push.
     """
     rel = module_str.replace(".", os.sep)
 
+    if repo_paths is not None:
+        rel_posix = module_str.replace(".", "/")
+        if rel_posix + ".py" in repo_paths:
+            return os.path.normpath(rel + ".py")
+        if rel_posix + "/__init__.py" in repo_paths:
+            return os.path.normpath(os.path.join(rel, "__init__.py"))
+
     # Try <module>.py
     candidate_py = os.path.normpath(os.path.join(repo_root, rel + ".py"))
     if os.path.isfile(candidate_py):
@@ -787,35 +1312,73 @@ def resolve_to_repo_path(
 
 
 def scan_imports(
-    filepath: str, head_content: str, repo_root: str,
+    filepath: str, head_content: Source, repo_root: str,
+    repo_paths: Optional[FrozenSet[str]] = None,
 ) -> List[str]:
     """
     Check 4 helper — return repo-relative paths for every project-internal
     import found in *head_content*.
 
     Chains :func:`extract_imports` → :func:`resolve_to_repo_path`, filtering
-    out any ``None`` (stdlib / third-party) results.
+    out any ``None`` (stdlib / third-party) results. *repo_paths* is
+    forwarded to :func:`resolve_to_repo_path`.
     """
     raw_modules = extract_imports(head_content)
     resolved: List[str] = []
     for mod in raw_modules:
-        repo_path = resolve_to_repo_path(mod, repo_root)
+        repo_path = resolve_to_repo_path(mod, repo_root, repo_paths)
         if repo_path is not None:
             resolved.append(repo_path)
     return resolved
 
 
+def index_state_scopes(
+    all_state_records: List[Dict[str, Any]],
+) -> Dict[str, str]:
+    """Build the Check 4 ``normalised path → semantic_scope`` lookup."""
+    path_to_scope: Dict[str, str] = {}
+    for rec in all_state_records:
+        rec_path = _normalize_path(rec.get("path", ""))
+        rec_scope = rec.get("semantic_scope", "")
+        if rec_path:
+            path_to_scope[rec_path] = rec_scope
+    return path_to_scope
+
+
+@functools.lru_cache(maxsize=8)
+def _split_known_expected(
+    entry_paths: Tuple[str, ...],
+) -> Tuple[FrozenSet[str], Tuple[str, ...]]:
+    """
+    Split ``known_expected_cross_scope_imports`` paths into a set of exact
+    paths and a tuple of directory prefixes (entries ending with "/").
+    Memoized so every modified file in a push shares one split.
+    """
+    exact: Set[str] = set()
+    prefixes: List[str] = []
+    for entry_path in entry_paths:
+        if entry_path.endswith("/"):
+            prefixes.append(_normalize_path(entry_path.rstrip("/")))
+        else:
+            exact.add(_normalize_path(entry_path))
+    return frozenset(exact), tuple(prefixes)
+
+
 def validate_dependencies(
     scanned_imports: List[str],
     state_record: Optional[Dict[str, Any]],
     all_state_records: List[Dict[str, Any]],
     scope_definitions: Optional[Dict[str, Any]],
     agent_semantic_scope: str,
+    path_to_scope: Optional[Dict[str, str]] = None,
 ) -> Dict[str, Any]:
     """
     Check 4 — compare *scanned_imports* against declared dependencies
     in *state_record* and detect cross-scope undeclared imports.
 
+    Pass *path_to_scope* (from :func:`index_state_scopes`) to reuse one
+    lookup across every modified file; it is built here otherwise.
+
     Returns ``{"undeclared_imports": [...], "stale_declared_deps": [...],
     "cross_scope_undeclared": [...]}``.
     """
@@ -833,13 +1396,9 @@ def validate_dependencies(
         undeclared = sorted(scanned_set)
         stale: List[str] = []
 
-    # Build a mapping of normalised-path → semantic_scope from all records.
-    path_to_scope: Dict[str, str] = {}
-    for rec in all_state_records:
-        rec_path = _normalize_path(rec.get("path", ""))
-        rec_scope = rec.get("semantic_scope", "")
-        if rec_path:
-            path_to_scope[rec_path] = rec_scope
+    # Mapping of normalised-path → semantic_scope from all records.
+    if path_to_scope is None:
+        path_to_scope = index_state_scopes(all_state_records)
 
     # Known expected cross-scope imports (prefix-matching for entries
     # ending with "/").
@@ -849,17 +1408,22 @@ def validate_dependencies(
             "known_expected_cross_scope_imports", []
         )
 
+    # Split into exact paths and a prefix tuple on first use, so each
+    # candidate is one set lookup plus one C-level str.startswith.
+    expected_exact: FrozenSet[str] = frozenset()
+    expected_prefixes: Tuple[str, ...] = ()
+    expected_ready = False
+
     def _is_known_expected(imp: str) -> bool:
+        nonlocal expected_exact, expected_prefixes, expected_ready
+        if not expected_ready:
+            expected_exact, expected_prefixes = _split_known_expected(tuple(
+                entry if isinstance(entry, str) else entry.get("imported_path", "")
+                for entry in known_expected
+            ))
+            expected_ready = True
         norm = _normalize_path(imp)
-        for entry in known_expected:
-            entry_path = entry if isinstance(entry, str) else entry.get("imported_path", "")
-            if entry_path.endswith("/"):
-                if norm.startswith(_normalize_path(entry_path.rstrip("/"))):
-                    return True
-            else:
-                if norm == _normalize_path(entry_path):
-                    return True
-        return False
+        return norm in expected_exact or norm.startswith(expected_prefixes)
 
     cross_scope_undeclared: List[str] = []
     # Check all undeclared imports (for new files this is the full set).
@@ -926,22 +1490,108 @@ def atomic_write_knowledge(
     """
     Atomically write *knowledge* to *knowledge_path* via
     temp-and-rename.  Exits with code 1 on failure.
+
+    Uses the extension's 2-space layout, except for very large files
+    (more than ``KNOWLEDGE_COMPACT_MIN_ENTRIES`` Queue + State entries),
+    which are written compact: ``indent`` forces json's pure-Python
+    encoder, while compact output goes through the C encoder. The bytes
+    go straight to the descriptor with ``os.write`` (no file-object
+    buffering) and are synced to disk before the rename.
     """
+    entries = len(knowledge.get("queue", [])) + len(knowledge.get("state", []))
+    if entries > KNOWLEDGE_COMPACT_MIN_ENTRIES:
+        serialized = json.dumps(knowledge, separators=(",", ":"))
+    else:
+        serialized = json.dumps(knowledge, indent=2)
+    data = memoryview(serialized.encode("utf-8") + b"\n")
     tmp_path = knowledge_path + ".tmp"
     try:
-        with open(tmp_path, "w", encoding="utf-8") as f:
-            json.dump(knowledge, f, indent=2)
-            f.write("\n")
+        flags = os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, "O_BINARY", 0)
+        fd = os.open(tmp_path, flags, 0o666)
+        try:
+            while data:
+                data = data[os.write(fd, data):]
+            if hasattr(os, "fdatasync"):
+                os.fdatasync(fd)
+            else:
+                os.fsync(fd)
+        finally:
+            os.close(fd)
         os.replace(tmp_path, knowledge_path)
     except OSError as exc:
         print(f"SKL: Failed to write knowledge.json — {exc}")
         sys.exit(1)
 
 
+def _analyze_modified_file(
+    filepath: str,
+    cat_file: GitCatFileBatch,
+    base_branch: str,
+    repo_root: str,
+    state_records: List[Dict[str, Any]],
+    state_by_path: Dict[str, Dict[str, Any]],
+    state_deps: StateDependencyIndex,
+    security_patterns: AbstractSet[str],
+    scope_defs: Optional[Dict[str, Any]],
+    agent_semantic_scope: str,
+    repo_paths: Optional[FrozenSet[str]] = None,
+    path_to_scope: Optional[Dict[str, str]] = None,
+) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    """
+    Run Checks 3 and 4 for one modified file and return its
+    ``(risk_signals, dependency_scan)`` pair.
+
+    Independent per file, so ``main`` may run it on a thread pool.
+    """
+    # ── Check 3: Risk Signals (Python files only) ──────────────
+    is_py = filepath.endswith(".py")
+    if is_py:
+        base_content = cat_file.get(filepath, base_branch)
+        head_content = cat_file.get(filepath, "HEAD")
+        if head_content is None:
+            head_content = b""
+        risk_signals = build_risk_signals(
+            base_content, head_content, filepath,
+            state_records, security_patterns, state_deps,
+        )
+    else:
+        # No blob fetch or parse for non-Python files.
+        head_content = b""
+        risk_signals = _non_python_risk_signals(
+            filepath, state_records, state_deps,
+        )
+
+    # ── Check 4: Dependency Scan (Python files only) ───────────
+    if is_py and head_content:
+        scanned = scan_imports(filepath, head_content, repo_root, repo_paths)
+    else:
+        scanned = []
+
+    state_rec = state_by_path.get(_normalize_path(filepath))
+    dep_scan = validate_dependencies(
+        scanned, state_rec, state_records,
+        scope_defs, agent_semantic_scope, path_to_scope,
+    )
+    return risk_signals, dep_scan
+
+
+def _clear_caches() -> None:
+    """Drop the per-push parse, path and module-resolution memo tables."""
+    _safe_parse.cache_clear()
+    _analyze_head.cache_clear()
+    resolve_to_repo_path.cache_clear()
+    _normalize_path.cache_clear()
+    _security_prefilter.cache_clear()
+    _split_known_expected.cache_clear()
+
+
 # ── Main ────────────────────────────────────────────────────────────
 
 def main() -> None:
     # ── Startup ─────────────────────────────────────────────────
+    # Scope every memo table to this push, even if main() runs more than
+    # once in one interpreter.
+    _clear_caches()
     script_path = os.path.abspath(__file__)
     repo_root = find_repo_root(os.path.dirname(script_path))
     if repo_root is None:
@@ -1013,7 +1663,8 @@ def main() -> None:
             )
 
     # ── Check 1: File Scope Validation ──────────────────────────
-    modified_files = get_modified_files(repo_root, base_branch)
+    head_oids: Dict[str, Optional[str]] = {}
+    modified_files = get_modified_files(repo_root, base_branch, head_oids)
     if modified_files is None:
         print(
             f"SKL: Warning — could not run git diff against '{base_branch}'. "
@@ -1051,6 +1702,11 @@ def main() -> None:
     if queue_error is not None:
         print(queue_error)
         sys.exit(1)
+    # Checks 6 and 7 share one read of .skl/rfcs/ and one Queue index.
+    rfcs_dir = os.path.join(skl_dir, "rfcs")
+    rfcs = load_all_rfcs(rfcs_dir) if SKL_MODE == "full" else []
+    queue_by_id = index_queue(knowledge) if rfcs else {}
+
     # ── Check 6: Acceptance Criteria Gate ───────────────────────
     if SKL_MODE == "full":
         # Resolve the current branch; skip silently on any git failure.
@@ -1059,87 +1715,103 @@ def main() -> None:
             _cb = subprocess.run(
                 ["git", "rev-parse", "--abbrev-ref", "HEAD"],
                 capture_output=True,
-                text=True,
                 cwd=repo_root,
             )
             if _cb.returncode == 0:
-                _current_branch = _cb.stdout.strip()
+                _current_branch = _cb.stdout.decode(
+                    "utf-8", errors="replace",
+                ).strip()
         except (OSError, subprocess.SubprocessError):
             pass
 
         if _current_branch is not None:
-            rfcs_dir = os.path.join(skl_dir, "rfcs")
             if not check_acceptance_criteria(
-                knowledge, agent_context, _current_branch, rfcs_dir
+                knowledge, agent_context, _current_branch, rfcs_dir,
+                rfcs=rfcs, queue_by_id=queue_by_id,
             ):
                 sys.exit(1)
 
     # ── Check 7: RFC Scope Pause ─────────────────────────────────
     if SKL_MODE == "full":
-        rfcs_dir = os.path.join(skl_dir, "rfcs")
-        if not check_rfc_scope_pause(knowledge, agent_context, rfcs_dir):
+        if not check_rfc_scope_pause(
+            knowledge, agent_context, rfcs_dir,
+            rfcs=rfcs, queue_by_id=queue_by_id,
+        ):
             sys.exit(1)
 
     # ── Collect State records & security patterns ───────────────
     state_records: List[Dict[str, Any]] = knowledge.get("state", [])
     invariants = knowledge.get("invariants", {})
-    security_patterns: List[str] = invariants.get("security_patterns", [])
+    # Frozen once so every file's pattern check is a set intersection.
+    security_patterns: AbstractSet[str] = frozenset(
+        invariants.get("security_patterns", [])
+    )
 
     # Build a lookup of normalised path → state record.
-    state_by_path: Dict[str, Dict[str, Any]] = {}
-    for rec in state_records:
-        rp = _normalize_path(rec.get("path", ""))
-        if rp:
-            state_by_path[rp] = rec
+    state_by_path: Dict[str, Dict[str, Any]] = {
+        rp: rec
+        for rec in state_records
+        if (rp := _normalize_path(rec.get("path", "")))
+    }
+    state_deps = index_state_dependencies(state_records)
+    path_to_scope = index_state_scopes(state_records)
 
     current_queue: List[Dict[str, Any]] = knowledge.get("queue", [])
     queue_length = len(current_queue)
 
     proposals: List[Dict[str, Any]] = []
+    cat_file = GitCatFileBatch(repo_root)
+    cat_file.prefetch(
+        (f for f in modified_files if f.endswith(".py")),
+        (base_branch, "HEAD"),
+        known_oids={f"HEAD:{p}": oid for p, oid in head_oids.items()},
+    )
+
+    # ── Checks 3 & 4: per-file analysis ─────────────────────────
+    # Check 4 resolves imports against one listing of HEAD's tree rather
+    # than probing the disk per module (falls back to disk if git fails).
+    repo_paths = (
+        list_repo_paths(repo_root)
+        if any(f.endswith(".py") for f in modified_files)
+        else None
+    )
+    analyze = functools.partial(
+        _analyze_modified_file,
+        cat_file=cat_file,
+        base_branch=base_branch,
+        repo_root=repo_root,
+        state_records=state_records,
+        state_by_path=state_by_path,
+        state_deps=state_deps,
+        security_patterns=security_patterns,
+        scope_defs=scope_defs,
+        agent_semantic_scope=agent_semantic_scope,
+        repo_paths=repo_paths,
+        path_to_scope=path_to_scope,
+    )
+    if os.environ.get(PARALLEL_ENV_VAR) == "1" and len(modified_files) > 1:
+        workers = min(PARALLEL_MAX_WORKERS, os.cpu_count() or 4)
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            analyses = list(pool.map(analyze, modified_files))
+    else:
+        analyses = [analyze(filepath) for filepath in modified_files]
+    cat_file.close()
 
-    for filepath in modified_files:
+    # Proposals are numbered in diff order, so build them sequentially.
+    blocking = 0
+    for filepath, (risk_signals, dep_scan) in zip(modified_files, analyses):
         viol = violations.get(filepath)
         is_oos = viol.out_of_scope if viol else False
         is_cs = viol.cross_scope_flag if viol else False
 
-        # ── Check 3: Risk Signals (Python files only) ──────────
-        is_py = filepath.endswith(".py")
-        if is_py:
-            base_content = get_file_content_at_ref(
-                filepath, base_branch, repo_root
-            )
-            head_content = get_file_content_at_ref(
-                filepath, "HEAD", repo_root
-            )
-            if head_content is None:
-                head_content = ""
-            risk_signals = build_risk_signals(
-                base_content, head_content, filepath,
-                state_records, security_patterns,
-            )
-        else:
-            risk_signals = build_risk_signals(
-                None, "", filepath, state_records, security_patterns,
-            )
-
-        # ── Check 4: Dependency Scan (Python files only) ───────
-        if is_py and head_content:
-            scanned = scan_imports(filepath, head_content, repo_root)
-        else:
-            scanned = []
-
-        state_rec = state_by_path.get(_normalize_path(filepath))
-        dep_scan = validate_dependencies(
-            scanned, state_rec, state_records,
-            scope_defs, agent_semantic_scope,
-        )
-
         # ── Build proposal ─────────────────────────────────────
         proposal = build_proposal(
             agent_context, filepath, is_oos, is_cs,
             risk_signals, dep_scan, queue_length + len(proposals),
         )
         proposals.append(proposal)
+        if proposal.get("blocking_reasons"):
+            blocking += 1
 
     # ── Atomic write ────────────────────────────────────────────
     if proposals:
@@ -1148,9 +1820,6 @@ def main() -> None:
         atomic_write_knowledge(knowledge_path, knowledge)
 
     # ── Summary ─────────────────────────────────────────────────
-    blocking = sum(
-        1 for p in proposals if p.get("blocking_reasons")
-    )
     if SKL_MODE == "phase_0":
         print(
             f"SKL Phase 0: {len(proposals)} activity record(s) logged. "
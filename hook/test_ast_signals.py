@@ -2,24 +2,22 @@
 test_ast_signals.py — stdlib-only tests for AST risk signal helpers.
 
 Tests compute_mechanical_only() and compute_public_api_signature_changed()
-with synthetic source strings.
+with synthetic source strings, and the GitCatFileBatch reader that feeds
+them head/base content, against a temporary git repository.
 
 Run: python hook/test_ast_signals.py
 """
 from __future__ import annotations
 
-import importlib.util
+import io
 import os
+import shutil
+import subprocess
 import sys
+import tempfile
 
 # ── Import the hook module (filename contains a hyphen) ─────────────
-_spec = importlib.util.spec_from_file_location(
-    "pre_push",
-    os.path.join(os.path.dirname(os.path.abspath(__file__)), "pre-push.py"),
-)
-assert _spec is not None and _spec.loader is not None
-pre_push = importlib.util.module_from_spec(_spec)
-_spec.loader.exec_module(pre_push)
+from _load_pre_push import pre_push
 
 compute_mechanical_only = pre_push.compute_mechanical_only
 compute_public_api_signature_changed = pre_push.compute_public_api_signature_changed
@@ -28,6 +26,7 @@ compute_invariant_referenced_file_modified = pre_push.compute_invariant_referenc
 compute_high_fan_in = pre_push.compute_high_fan_in
 derive_ast_change_type = pre_push.derive_ast_change_type
 build_risk_signals = pre_push.build_risk_signals
+GitCatFileBatch = pre_push.GitCatFileBatch
 
 passed = 0
 failed = 0
@@ -304,6 +303,154 @@ assert_eq(signals_11["touched_auth_or_permission_patterns"], True,
 assert_eq(signals_11["mechanical_only"], False,
           "security pattern match → mechanical_only: False despite mechanical AST")
 
+# ════════════════════════════════════════════════════════════════════
+# Test 12: Identical base and head → mechanical, no API change;
+#          unparseable identical sources keep the safe defaults
+# ════════════════════════════════════════════════════════════════════
+print("\n=== Test 12: Identical base and head ====")
+
+same_12 = '''\
+def handler(request, *, strict=False):
+    return request
+'''
+assert_eq(compute_mechanical_only(same_12, same_12), True,
+          "identical sources → mechanical_only: True")
+assert_eq(compute_public_api_signature_changed(same_12, same_12), False,
+          "identical sources → public_api_signature_changed: False")
+signals_12 = build_risk_signals(same_12, same_12, "src/h.py", [], [])
+assert_eq(signals_12["ast_change_type"], "mechanical",
+          "identical sources → ast_change_type: mechanical")
+
+broken_12 = "def broken(:\n"
+assert_eq(compute_mechanical_only(broken_12, broken_12), False,
+          "identical unparseable sources → mechanical_only: False")
+assert_eq(compute_public_api_signature_changed(broken_12, broken_12), True,
+          "identical unparseable sources → public_api_signature_changed: True")
+
+# ════════════════════════════════════════════════════════════════════
+# Test 13: Raw bytes — PEP 263 coding declarations are honoured and
+#          null bytes fall back to the safe defaults
+# ════════════════════════════════════════════════════════════════════
+print("\n=== Test 13: Raw bytes source ====")
+
+base_13 = (
+    "# -*- coding: latin-1 -*-\n"
+    "def café(x):\n"
+    "    return x\n"
+).encode("latin-1")
+head_13 = (
+    "# -*- coding: latin-1 -*-\n"
+    "def café(x):\n"
+    '    """Return x unchanged."""\n'
+    "    return x\n"
+).encode("latin-1")
+assert_eq(compute_mechanical_only(base_13, head_13), True,
+          "latin-1 bytes, docstring added → mechanical_only: True")
+assert_eq(compute_public_api_signature_changed(base_13, head_13), False,
+          "latin-1 bytes, same signature → public_api_signature_changed: False")
+
+nul_13 = b"x = 1\x00\n"
+assert_eq(compute_mechanical_only(nul_13, nul_13 + b"y = 2\n"), False,
+          "null bytes → mechanical_only: False (no crash)")
+assert_eq(compute_public_api_signature_changed(nul_13, nul_13), True,
+          "null bytes → public_api_signature_changed: True (no crash)")
+
+# ════════════════════════════════════════════════════════════════════
+# Test 14: GitCatFileBatch — batch framing and git show fallback
+# ════════════════════════════════════════════════════════════════════
+print("\n=== Test 14: GitCatFileBatch ====")
+
+
+def _git(repo: str, *args: str) -> None:
+    subprocess.run(
+        ["git", "-c", "user.name=skl", "-c", "user.email=skl@example.com",
+         *args],
+        cwd=repo, check=True, capture_output=True,
+    )
+
+
+class _FakeCatFile:
+    """Stand-in child whose stdout replays a canned (truncated) reply."""
+
+    def __init__(self, reply: bytes) -> None:
+        self.stdin = io.BytesIO()
+        self.stdout = io.BytesIO(reply)
+
+    def wait(self) -> int:
+        return 0
+
+
+repo_14 = tempfile.mkdtemp(prefix="skl_test_catfile_")
+content_14 = b"def f():\n    return 1\n"
+os.makedirs(os.path.join(repo_14, "pkg"))
+with open(os.path.join(repo_14, "app.py"), "wb") as f:
+    f.write(content_14)
+with open(os.path.join(repo_14, "pkg", "mod.py"), "wb") as f:
+    f.write(b"")
+_git(repo_14, "init", "-q")
+_git(repo_14, "add", ".")
+_git(repo_14, "commit", "-q", "-m", "init")
+
+# Interactive child: blob, missing object, non-blob (tree) object.
+cat_14 = GitCatFileBatch(repo_14)
+assert_eq(cat_14.get("app.py", "HEAD"), content_14,
+          "blob → content via the interactive child")
+assert_eq(cat_14.get("missing.py", "HEAD"), None,
+          "missing object → None")
+assert_eq(cat_14.get("pkg", "HEAD"), None,
+          "tree object → None (not a blob)")
+assert_eq(cat_14.get("app.py", "HEAD"), content_14,
+          "child still in sync after missing and non-blob replies")
+cat_14.close()
+
+# Prefetch: served from memory, without starting the interactive child.
+cat_14 = GitCatFileBatch(repo_14)
+cat_14.prefetch(["app.py", "missing.py", "pkg"], ["HEAD"])
+assert_eq(
+    [cat_14.get(p, "HEAD") for p in ("app.py", "missing.py", "pkg")],
+    [content_14, None, None],
+    "prefetch → blob, missing and non-blob resolved in one batch",
+)
+assert_eq(cat_14._proc, None, "prefetched lookups start no child process")
+cat_14.close()
+
+# Truncated prefetch reply: parsing stops, later names stay unresolved.
+replies_14 = GitCatFileBatch._parse_batch_reply(
+    ["HEAD:a.py", "HEAD:b.py", "HEAD:c.py"],
+    b"1111 blob 3\nabc\nHEAD:b.py missing\n2222 blob 10\nabc",
+)
+assert_eq(replies_14, {"HEAD:a.py": b"abc", "HEAD:b.py": None},
+          "truncated batch reply → only the complete replies are kept")
+
+# Truncated interactive reply: falls back to git show and drops the child.
+cat_14 = GitCatFileBatch(repo_14)
+cat_14._started = True
+cat_14._proc = _FakeCatFile(b"1111 blob 100\nshort")
+assert_eq(cat_14.get("app.py", "HEAD"), content_14,
+          "short read from the child → content via git show fallback")
+assert_eq(cat_14._proc, None, "short read → child closed")
+assert_eq(cat_14.get("missing.py", "HEAD"), None,
+          "git show fallback → None for a missing path")
+cat_14.close()
+
+shutil.rmtree(repo_14, ignore_errors=True)
+
+# ════════════════════════════════════════════════════════════════════
+# Test 15: Deeply nested expression — head facts are collected without
+#          hitting the recursion limit
+# ════════════════════════════════════════════════════════════════════
+print("\n=== Test 15: Deeply nested expression ====")
+
+head_15 = "x = " + " + ".join(["password"] * 700) + "\n"
+
+signals_15 = build_risk_signals(None, head_15, "deep.py", [], ["password"])
+assert_eq(signals_15["touched_auth_or_permission_patterns"], True,
+          "700-term expression → pattern found, no RecursionError")
+assert_eq(signals_15["mechanical_only"], False,
+          "700-term expression, new file → mechanical_only: False")
+assert_eq(compute_auth_pattern_touched(head_15, ["token"]), False,
+          "700-term expression → unmatched pattern: False")
+
 # ════════════════════════════════════════════════════════════════════
 # Summary
 # ════════════════════════════════════════════════════════════════════
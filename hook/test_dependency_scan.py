@@ -8,19 +8,12 @@ Run: python hook/test_dependency_scan.py
 """
 from __future__ import annotations
 
-import importlib.util
 import os
 import sys
 import tempfile
 
 # ── Import the hook module (filename contains a hyphen) ─────────────
-_spec = importlib.util.spec_from_file_location(
-    "pre_push",
-    os.path.join(os.path.dirname(os.path.abspath(__file__)), "pre-push.py"),
-)
-assert _spec is not None and _spec.loader is not None
-pre_push = importlib.util.module_from_spec(_spec)
-_spec.loader.exec_module(pre_push)
+from _load_pre_push import pre_push
 
 extract_imports = pre_push.extract_imports
 resolve_to_repo_path = pre_push.resolve_to_repo_path
@@ -90,6 +83,11 @@ assert_eq("app.models" in imports_1, True,
 # Relative import with no module should be skipped
 assert_eq("something" not in imports_1, True,
           "from . import something → module string skipped (relative, no module)")
+assert_eq(extract_imports(b"x = 1\n"), [],
+          "no import keyword → empty list without parsing")
+imports_1.append("INJECTED")
+assert_eq("INJECTED" in extract_imports(source_1), False,
+          "mutating a returned list does not leak into later calls")
 
 
 # ════════════════════════════════════════════════════════════════════
@@ -151,10 +149,14 @@ assert_eq(
     os.path.normpath("app/models/__init__.py") in resolved, True,
     "app.models resolved to app/models/__init__.py",
 )
-# os should NOT appear (no os.py in our mock repo)
-has_os = any("os" in p and "tokens" not in p and "models" not in p
-             for p in resolved)
-assert_eq(has_os, False, "os (stdlib) filtered out")
+# os should NOT appear (no os.py in our mock repo): exactly the two
+# project-internal modules resolve.
+assert_eq(
+    set(resolved),
+    {os.path.normpath("app/utils/tokens.py"),
+     os.path.normpath("app/models/__init__.py")},
+    "os (stdlib) filtered out",
+)
 
 
 # ════════════════════════════════════════════════════════════════════
@@ -401,6 +403,54 @@ import shutil as _shutil_atomic
 _shutil_atomic.rmtree(atomic_dir, ignore_errors=True)
 
 
+# ════════════════════════════════════════════════════════════════════
+# Test 13: resolve_to_repo_path / scan_imports with a repo_paths set
+# ════════════════════════════════════════════════════════════════════
+print("\n=== Test 13: resolution against repo_paths ===")
+
+# Listing differs from the mock tree on disk: the set is tried first,
+# then os.path.isfile for modules it misses.
+repo_paths_13 = frozenset({
+    "app/utils/tokens.py",
+    "app/models/__init__.py",
+    "lib/only_in_git.py",
+})
+assert_eq(
+    resolve_to_repo_path("lib.only_in_git", tmpdir, repo_paths_13),
+    os.path.normpath("lib/only_in_git.py"),
+    "module listed in repo_paths resolves without a file on disk",
+)
+assert_eq(
+    resolve_to_repo_path("app.models.user", tmpdir, repo_paths_13),
+    os.path.normpath("app/models/user.py"),
+    "module on disk but absent from repo_paths → os.path.isfile fallback",
+)
+assert_eq(
+    resolve_to_repo_path("lib.nowhere", tmpdir, repo_paths_13),
+    None,
+    "module neither in repo_paths nor on disk → None",
+)
+assert_eq(
+    scan_imports("app/x.py", source_1, tmpdir, repo_paths_13),
+    [os.path.normpath("app/utils/tokens.py"),
+     os.path.normpath("app/models/__init__.py")],
+    "scan_imports resolves through repo_paths",
+)
+
+
+# ════════════════════════════════════════════════════════════════════
+# Test 14: extract_imports on a deeply nested expression
+# ════════════════════════════════════════════════════════════════════
+print("\n=== Test 14: deeply nested expression ===")
+
+source_14 = "import os\nx = " + " + ".join(["a"] * 700) + "\n"
+assert_eq(
+    extract_imports(source_14),
+    ["os"],
+    "700-term expression → imports collected, no RecursionError",
+)
+
+
 # ════════════════════════════════════════════════════════════════════
 # Cleanup & Summary
 # ════════════════════════════════════════════════════════════════════
@@ -5,33 +5,30 @@ Run: python hook/test_hook_checks.py
 """
 from __future__ import annotations
 
+import contextlib
 import io
 import json
 import os
+import shutil
+import subprocess
 import sys
 import tempfile
 
 # Ensure the hook directory is importable.
-sys.path.insert(0, os.path.join(os.path.dirname(__file__)))
+_HOOK_DIR = os.path.dirname(os.path.abspath(__file__))
+if _HOOK_DIR not in sys.path:
+    sys.path.insert(0, _HOOK_DIR)
 
-# Import the functions under test from the pre-push hook module.
-# Python allows importing .py files without the hyphen trick because the
-# filename is pre-push.py which contains a hyphen — we use importlib.
-import importlib.util
-
-_spec = importlib.util.spec_from_file_location(
-    "pre_push",
-    os.path.join(os.path.dirname(os.path.abspath(__file__)), "pre-push.py"),
-)
-assert _spec is not None and _spec.loader is not None
-pre_push = importlib.util.module_from_spec(_spec)
-_spec.loader.exec_module(pre_push)
+# Import the functions under test from the pre-push hook module. The
+# filename pre-push.py contains a hyphen, so the shared loader imports it.
+from _load_pre_push import pre_push  # noqa: E402
 
 check_file_scope = pre_push.check_file_scope
 check_semantic_scope = pre_push.check_semantic_scope
 check_queue_budget = pre_push.check_queue_budget
 check_acceptance_criteria = pre_push.check_acceptance_criteria
 check_rfc_scope_pause = pre_push.check_rfc_scope_pause
+get_modified_files = pre_push.get_modified_files
 
 passed = 0
 failed = 0
@@ -47,6 +44,23 @@ def assert_true(condition: bool, label: str) -> None:
         print(f"  FAIL — {label}")
 
 
+# One shared pending entry for the Check 5 queues. check_queue_budget only
+# reads "status", so aliasing it is safe; it must stay a real dict, since
+# non-dict queue entries are not counted.
+_PENDING = {"status": "pending"}
+
+
+# One reusable compact encoder: json.dumps with non-default separators
+# would construct a fresh JSONEncoder on every call.
+_encode_json = json.JSONEncoder(separators=(",", ":")).encode
+
+
+def _write_json(path: str, obj: object) -> None:
+    """Write *obj* as compact JSON in one C-encoded pass and one write."""
+    with open(path, "wb") as f:
+        f.write(_encode_json(obj).encode("utf-8"))
+
+
 # ════════════════════════════════════════════════════════════════════
 # Test 1: Check 1 — out-of-scope file detection
 # ════════════════════════════════════════════════════════════════════
@@ -117,7 +131,7 @@ assert_true(
 print("\n=== Test 4: Check 5 — queue full ===")
 
 knowledge_full = {
-    "queue": [{"status": "pending"} for _ in range(15)],
+    "queue": [_PENDING] * 15,
 }
 error = check_queue_budget(knowledge_full, queue_max=15)
 assert_true(
@@ -135,7 +149,7 @@ assert_true(
 print("\n=== Test 5: Check 5 — queue under budget ===")
 
 knowledge_ok = {
-    "queue": [{"status": "pending"} for _ in range(14)],
+    "queue": [_PENDING] * 14,
 }
 error_ok = check_queue_budget(knowledge_ok, queue_max=15)
 assert_true(
@@ -164,8 +178,7 @@ with tempfile.TemporaryDirectory() as tmpdir:
             }
         ],
     }
-    with open(os.path.join(tmpdir, "RFC_006.json"), "w") as f:
-        json.dump(rfc_all_passed, f)
+    _write_json(os.path.join(tmpdir, "RFC_006.json"), rfc_all_passed)
 
     knowledge_6 = {
         "queue": [
@@ -186,148 +199,138 @@ with tempfile.TemporaryDirectory() as tmpdir:
 # ════════════════════════════════════════════════════════════════════
 print("\n=== Test 7: Check 6 — pending criterion, branch matches → blocks ===")
 
-with tempfile.TemporaryDirectory() as tmpdir:
-    rfc_pending = {
-        "id": "RFC_007",
-        "status": "open",
-        "merge_blocked_until_criteria_pass": True,
-        "triggering_proposal": "prop_20260301_agent1_002",
-        "acceptance_criteria": [
-            {
-                "ac_id": "AC_001",
-                "description": "All unit tests pass",
-                "check_type": "test_suite",
-                "check_reference": "pytest",
-                "status": "passed",
-            },
-            {
-                "ac_id": "AC_002",
-                "description": "Integration tests green",
-                "check_type": "test_suite",
-                "check_reference": "pytest::integration",
-                "status": "pending",
-            },
-        ],
-    }
-    with open(os.path.join(tmpdir, "RFC_007.json"), "w") as f:
-        json.dump(rfc_pending, f)
-
-    knowledge_7 = {
-        "queue": [
-            {
-                "proposal_id": "prop_20260301_agent1_002",
-                "branch": "feature/rfc-007",
-            }
-        ],
-    }
+rfc_pending = {
+    "id": "RFC_007",
+    "status": "open",
+    "merge_blocked_until_criteria_pass": True,
+    "triggering_proposal": "prop_20260301_agent1_002",
+    "acceptance_criteria": [
+        {
+            "ac_id": "AC_001",
+            "description": "All unit tests pass",
+            "check_type": "test_suite",
+            "check_reference": "pytest",
+            "status": "passed",
+        },
+        {
+            "ac_id": "AC_002",
+            "description": "Integration tests green",
+            "check_type": "test_suite",
+            "check_reference": "pytest::integration",
+            "status": "pending",
+        },
+    ],
+}
+rfcs_7 = [("RFC_007.json", rfc_pending)]
+
+knowledge_7 = {
+    "queue": [
+        {
+            "proposal_id": "prop_20260301_agent1_002",
+            "branch": "feature/rfc-007",
+        }
+    ],
+}
 
-    # Capture stdout to check the output message contains the criterion id.
-    captured = io.StringIO()
-    old_stdout = sys.stdout
-    sys.stdout = captured
+# Capture stdout to check the output message contains the criterion id.
+with contextlib.redirect_stdout(io.StringIO()) as captured:
     result = check_acceptance_criteria(
-        knowledge_7, {}, "feature/rfc-007", tmpdir
+        knowledge_7, {}, "feature/rfc-007", "", rfcs=rfcs_7
     )
-    sys.stdout = old_stdout
-    output = captured.getvalue()
+output = captured.getvalue()
 
-    assert_true(result is False, "pending criterion → Check 6 blocks")
-    assert_true(
-        "AC_002" in output,
-        "block message names the failing criterion (AC_002)",
-    )
-    assert_true(
-        "RFC_007" in output,
-        "block message names the RFC ID (RFC_007)",
-    )
+assert_true(result is False, "pending criterion → Check 6 blocks")
+assert_true(
+    "AC_002" in output,
+    "block message names the failing criterion (AC_002)",
+)
+assert_true(
+    "RFC_007" in output,
+    "block message names the RFC ID (RFC_007)",
+)
 
 # ════════════════════════════════════════════════════════════════════
 # Test 8: Check 6 — all criteria passed but branch does not match → passes
 # ════════════════════════════════════════════════════════════════════
 print("\n=== Test 8: Check 6 — branch does not match → passes ===")
 
-with tempfile.TemporaryDirectory() as tmpdir:
-    rfc_other_branch = {
-        "id": "RFC_008",
-        "status": "open",
-        "merge_blocked_until_criteria_pass": True,
-        "triggering_proposal": "prop_20260301_agent1_003",
-        "acceptance_criteria": [
-            {
-                "ac_id": "AC_001",
-                "description": "All unit tests pass",
-                "check_type": "test_suite",
-                "check_reference": "pytest",
-                "status": "pending",  # would block — but branch won't match
-            }
-        ],
-    }
-    with open(os.path.join(tmpdir, "RFC_008.json"), "w") as f:
-        json.dump(rfc_other_branch, f)
-
-    knowledge_8 = {
-        "queue": [
-            {
-                "proposal_id": "prop_20260301_agent1_003",
-                "branch": "feature/rfc-008",
-            }
-        ],
-    }
+rfc_other_branch = {
+    "id": "RFC_008",
+    "status": "open",
+    "merge_blocked_until_criteria_pass": True,
+    "triggering_proposal": "prop_20260301_agent1_003",
+    "acceptance_criteria": [
+        {
+            "ac_id": "AC_001",
+            "description": "All unit tests pass",
+            "check_type": "test_suite",
+            "check_reference": "pytest",
+            "status": "pending",  # would block — but branch won't match
+        }
+    ],
+}
+rfcs_8 = [("RFC_008.json", rfc_other_branch)]
+
+knowledge_8 = {
+    "queue": [
+        {
+            "proposal_id": "prop_20260301_agent1_003",
+            "branch": "feature/rfc-008",
+        }
+    ],
+}
 
-    result = check_acceptance_criteria(
-        knowledge_8, {}, "main", tmpdir  # current branch is 'main', not the RFC branch
-    )
-    assert_true(
-        result is True,
-        "branch mismatch → RFC skipped, Check 6 passes",
-    )
+result = check_acceptance_criteria(
+    knowledge_8, {}, "main", "", rfcs=rfcs_8  # current branch is 'main', not the RFC branch
+)
+assert_true(
+    result is True,
+    "branch mismatch → RFC skipped, Check 6 passes",
+)
 
 # ════════════════════════════════════════════════════════════════════
 # Test 9: Check 6 — no RFC files in directory → passes immediately
 # ════════════════════════════════════════════════════════════════════
 print("\n=== Test 9: Check 6 — no RFC files → passes immediately ===")
 
-with tempfile.TemporaryDirectory() as empty_dir:
-    result = check_acceptance_criteria({}, {}, "feature/anything", empty_dir)
-    assert_true(result is True, "empty rfcs dir → Check 6 passes immediately")
+result = check_acceptance_criteria({}, {}, "feature/anything", "", rfcs=[])
+assert_true(result is True, "no RFCs → Check 6 passes immediately")
 
 # ════════════════════════════════════════════════════════════════════
 # Test 10: Check 6 — RFC with status "resolved" → skipped
 # ════════════════════════════════════════════════════════════════════
 print("\n=== Test 10: Check 6 — resolved RFC → skipped ===")
 
-with tempfile.TemporaryDirectory() as tmpdir:
-    rfc_resolved = {
-        "id": "RFC_010",
-        "status": "resolved",  # not "open" → skipped
-        "merge_blocked_until_criteria_pass": True,
-        "triggering_proposal": "prop_20260301_agent1_004",
-        "acceptance_criteria": [
-            {
-                "ac_id": "AC_001",
-                "description": "All unit tests pass",
-                "check_type": "test_suite",
-                "check_reference": "pytest",
-                "status": "pending",  # would block if open
-            }
-        ],
-    }
-    with open(os.path.join(tmpdir, "RFC_010.json"), "w") as f:
-        json.dump(rfc_resolved, f)
-
-    knowledge_10 = {
-        "queue": [
-            {
-                "proposal_id": "prop_20260301_agent1_004",
-                "branch": "feature/rfc-010",
-            }
-        ],
-    }
+rfc_resolved = {
+    "id": "RFC_010",
+    "status": "resolved",  # not "open" → skipped
+    "merge_blocked_until_criteria_pass": True,
+    "triggering_proposal": "prop_20260301_agent1_004",
+    "acceptance_criteria": [
+        {
+            "ac_id": "AC_001",
+            "description": "All unit tests pass",
+            "check_type": "test_suite",
+            "check_reference": "pytest",
+            "status": "pending",  # would block if open
+        }
+    ],
+}
+rfcs_10 = [("RFC_010.json", rfc_resolved)]
+
+knowledge_10 = {
+    "queue": [
+        {
+            "proposal_id": "prop_20260301_agent1_004",
+            "branch": "feature/rfc-010",
+        }
+    ],
+}
 
-    result = check_acceptance_criteria(
-        knowledge_10, {}, "feature/rfc-010", tmpdir
-    )
-    assert_true(result is True, "resolved RFC → skipped, Check 6 passes")
+result = check_acceptance_criteria(
+    knowledge_10, {}, "feature/rfc-010", "", rfcs=rfcs_10
+)
+assert_true(result is True, "resolved RFC → skipped, Check 6 passes")
 
 # ════════════════════════════════════════════════════════════════════# Test 11: Check 7 — expired RFC, same semantic scope → blocks
 # ══════════════════════════════════════════════════════════════════
@@ -341,8 +344,7 @@ with tempfile.TemporaryDirectory() as tmpdir:
         "triggering_proposal": "prop_20260301_agent1_011",
         "human_response_deadline": past,
     }
-    with open(os.path.join(tmpdir, "RFC_011.json"), "w") as f:
-        json.dump(rfc_expired, f)
+    _write_json(os.path.join(tmpdir, "RFC_011.json"), rfc_expired)
 
     knowledge_11 = {
         "queue": [
@@ -354,142 +356,132 @@ with tempfile.TemporaryDirectory() as tmpdir:
     }
     agent_ctx_11 = {"semantic_scope": "backend"}
 
-    captured = io.StringIO()
-    old_stdout = sys.stdout
-    sys.stdout = captured
-    result = check_rfc_scope_pause(knowledge_11, agent_ctx_11, tmpdir)
-    sys.stdout = old_stdout
+    with contextlib.redirect_stdout(io.StringIO()) as captured:
+        result = check_rfc_scope_pause(knowledge_11, agent_ctx_11, tmpdir)
     output = captured.getvalue()
 
     assert_true(result is False, "expired RFC same scope → Check 7 blocks")
     assert_true("RFC_011" in output, "block message names the RFC ID")
     assert_true("backend" in output, "block message names the scope")
+    assert_true(f"passed {past}." in output,
+                "block message shows the deadline as written in the RFC")
 
 # ══════════════════════════════════════════════════════════════════
 # Test 12: Check 7 — expired RFC, different semantic scope → passes
 # ══════════════════════════════════════════════════════════════════
 print("\n=== Test 12: Check 7 — expired RFC, different scope → passes ===")
 
-with tempfile.TemporaryDirectory() as tmpdir:
-    rfc_other_scope = {
-        "id": "RFC_012",
-        "status": "open",
-        "triggering_proposal": "prop_20260301_agent1_012",
-        "human_response_deadline": "2020-01-01T00:00:00Z",
-    }
-    with open(os.path.join(tmpdir, "RFC_012.json"), "w") as f:
-        json.dump(rfc_other_scope, f)
-
-    knowledge_12 = {
-        "queue": [
-            {
-                "proposal_id": "prop_20260301_agent1_012",
-                "semantic_scope": "infra",  # different from agent's scope
-            }
-        ],
-    }
-    agent_ctx_12 = {"semantic_scope": "backend"}
+rfc_other_scope = {
+    "id": "RFC_012",
+    "status": "open",
+    "triggering_proposal": "prop_20260301_agent1_012",
+    "human_response_deadline": "2020-01-01T00:00:00Z",
+}
+rfcs_12 = [("RFC_012.json", rfc_other_scope)]
+
+knowledge_12 = {
+    "queue": [
+        {
+            "proposal_id": "prop_20260301_agent1_012",
+            "semantic_scope": "infra",  # different from agent's scope
+        }
+    ],
+}
+agent_ctx_12 = {"semantic_scope": "backend"}
 
-    result = check_rfc_scope_pause(knowledge_12, agent_ctx_12, tmpdir)
-    assert_true(
-        result is True,
-        "expired RFC different scope → Check 7 passes",
-    )
+result = check_rfc_scope_pause(knowledge_12, agent_ctx_12, "", rfcs=rfcs_12)
+assert_true(
+    result is True,
+    "expired RFC different scope → Check 7 passes",
+)
 
 # ══════════════════════════════════════════════════════════════════
 # Test 13: Check 7 — future deadline, same scope → passes
 # ══════════════════════════════════════════════════════════════════
 print("\n=== Test 13: Check 7 — future deadline, same scope → passes ===")
 
-with tempfile.TemporaryDirectory() as tmpdir:
-    # Deadline far in the future
-    rfc_future = {
-        "id": "RFC_013",
-        "status": "open",
-        "triggering_proposal": "prop_20260301_agent1_013",
-        "human_response_deadline": "2099-12-31T23:59:59Z",
-    }
-    with open(os.path.join(tmpdir, "RFC_013.json"), "w") as f:
-        json.dump(rfc_future, f)
-
-    knowledge_13 = {
-        "queue": [
-            {
-                "proposal_id": "prop_20260301_agent1_013",
-                "semantic_scope": "backend",
-            }
-        ],
-    }
-    agent_ctx_13 = {"semantic_scope": "backend"}
+# Deadline far in the future
+rfc_future = {
+    "id": "RFC_013",
+    "status": "open",
+    "triggering_proposal": "prop_20260301_agent1_013",
+    "human_response_deadline": "2099-12-31T23:59:59Z",
+}
+rfcs_13 = [("RFC_013.json", rfc_future)]
+
+knowledge_13 = {
+    "queue": [
+        {
+            "proposal_id": "prop_20260301_agent1_013",
+            "semantic_scope": "backend",
+        }
+    ],
+}
+agent_ctx_13 = {"semantic_scope": "backend"}
 
-    result = check_rfc_scope_pause(knowledge_13, agent_ctx_13, tmpdir)
-    assert_true(
-        result is True,
-        "future deadline same scope → RFC not expired, Check 7 passes",
-    )
+result = check_rfc_scope_pause(knowledge_13, agent_ctx_13, "", rfcs=rfcs_13)
+assert_true(
+    result is True,
+    "future deadline same scope → RFC not expired, Check 7 passes",
+)
 
 # ══════════════════════════════════════════════════════════════════
 # Test 14: Check 7 — resolved RFC with past deadline → skipped
 # ══════════════════════════════════════════════════════════════════
 print("\n=== Test 14: Check 7 — resolved RFC with past deadline → skipped ===")
 
-with tempfile.TemporaryDirectory() as tmpdir:
-    rfc_resolved_7 = {
-        "id": "RFC_014",
-        "status": "resolved",  # not open → skipped
-        "triggering_proposal": "prop_20260301_agent1_014",
-        "human_response_deadline": "2020-01-01T00:00:00Z",
-    }
-    with open(os.path.join(tmpdir, "RFC_014.json"), "w") as f:
-        json.dump(rfc_resolved_7, f)
-
-    knowledge_14 = {
-        "queue": [
-            {
-                "proposal_id": "prop_20260301_agent1_014",
-                "semantic_scope": "backend",
-            }
-        ],
-    }
-    agent_ctx_14 = {"semantic_scope": "backend"}
+rfc_resolved_7 = {
+    "id": "RFC_014",
+    "status": "resolved",  # not open → skipped
+    "triggering_proposal": "prop_20260301_agent1_014",
+    "human_response_deadline": "2020-01-01T00:00:00Z",
+}
+rfcs_14 = [("RFC_014.json", rfc_resolved_7)]
+
+knowledge_14 = {
+    "queue": [
+        {
+            "proposal_id": "prop_20260301_agent1_014",
+            "semantic_scope": "backend",
+        }
+    ],
+}
+agent_ctx_14 = {"semantic_scope": "backend"}
 
-    result = check_rfc_scope_pause(knowledge_14, agent_ctx_14, tmpdir)
-    assert_true(result is True, "resolved RFC with past deadline → skipped, Check 7 passes")
+result = check_rfc_scope_pause(knowledge_14, agent_ctx_14, "", rfcs=rfcs_14)
+assert_true(result is True, "resolved RFC with past deadline → skipped, Check 7 passes")
 
 # ══════════════════════════════════════════════════════════════════
 # Test 15: Check 7 — no RFC files → passes immediately
 # ══════════════════════════════════════════════════════════════════
 print("\n=== Test 15: Check 7 — no RFC files → passes immediately ===")
 
-with tempfile.TemporaryDirectory() as empty_dir:
-    agent_ctx_15 = {"semantic_scope": "backend"}
-    result = check_rfc_scope_pause({}, agent_ctx_15, empty_dir)
-    assert_true(result is True, "empty rfcs dir → Check 7 passes immediately")
+agent_ctx_15 = {"semantic_scope": "backend"}
+result = check_rfc_scope_pause({}, agent_ctx_15, "", rfcs=[])
+assert_true(result is True, "no RFCs → Check 7 passes immediately")
 
 # ══════════════════════════════════════════════════════════════════
 # Test 16: Check 7 — triggering proposal not found in Queue → RFC skipped
 # ══════════════════════════════════════════════════════════════════
 print("\n=== Test 16: Check 7 — triggering proposal not in Queue → skipped ===")
 
-with tempfile.TemporaryDirectory() as tmpdir:
-    rfc_missing_proposal = {
-        "id": "RFC_016",
-        "status": "open",
-        "triggering_proposal": "prop_does_not_exist",
-        "human_response_deadline": "2020-01-01T00:00:00Z",
-    }
-    with open(os.path.join(tmpdir, "RFC_016.json"), "w") as f:
-        json.dump(rfc_missing_proposal, f)
+rfc_missing_proposal = {
+    "id": "RFC_016",
+    "status": "open",
+    "triggering_proposal": "prop_does_not_exist",
+    "human_response_deadline": "2020-01-01T00:00:00Z",
+}
+rfcs_16 = [("RFC_016.json", rfc_missing_proposal)]
 
-    # Queue does not contain the triggering proposal
-    knowledge_16: dict = {"queue": []}
-    agent_ctx_16 = {"semantic_scope": "backend"}
+# Queue does not contain the triggering proposal
+knowledge_16: dict = {"queue": []}
+agent_ctx_16 = {"semantic_scope": "backend"}
 
-    result = check_rfc_scope_pause(knowledge_16, agent_ctx_16, tmpdir)
-    assert_true(
-        result is True,
-        "triggering proposal not found in Queue → RFC skipped, Check 7 passes",
-    )
+result = check_rfc_scope_pause(knowledge_16, agent_ctx_16, "", rfcs=rfcs_16)
+assert_true(
+    result is True,
+    "triggering proposal not found in Queue → RFC skipped, Check 7 passes",
+)
 
 # ════════════════════════════════════════════════════════════════════
 # Phase 0 mode tests — Substage 6.1
@@ -499,7 +491,7 @@ with tempfile.TemporaryDirectory() as tmpdir:
 # ══════════════════════════════════════════════════════════════════
 print("\n=== Test 17: Phase 0 — queue at 15 (below PHASE_0_QUEUE_MAX=50) → passes ===")
 knowledge_p0_15: dict = {
-    "queue": [{"status": "pending"} for _ in range(15)]
+    "queue": [_PENDING] * 15
 }
 result = check_queue_budget(knowledge_p0_15, 50)  # PHASE_0_QUEUE_MAX = 50
 assert_true(result is None, "Phase 0 queue at 15 → below limit of 50 → no error")
@@ -508,7 +500,7 @@ assert_true(result is None, "Phase 0 queue at 15 → below limit of 50 → no er
 # ══════════════════════════════════════════════════════════════════
 print("\n=== Test 18: Phase 0 — queue at 50 (at PHASE_0_QUEUE_MAX=50) → blocked ===")
 knowledge_p0_50: dict = {
-    "queue": [{"status": "pending"} for _ in range(50)]
+    "queue": [_PENDING] * 50
 }
 result = check_queue_budget(knowledge_p0_50, 50)
 assert_true(result is not None, "Phase 0 queue at 50 → at limit → Check 5 blocks")
@@ -540,8 +532,7 @@ with tempfile.TemporaryDirectory() as tmp20:
         "triggering_proposal": "prop_p0_001",
         "human_response_deadline": "2020-01-01T00:00:00Z",
     }
-    with open(os.path.join(tmp20, "RFC_P0_20.json"), "w") as f:
-        json.dump(rfc_p0, f)
+    _write_json(os.path.join(tmp20, "RFC_P0_20.json"), rfc_p0)
     knowledge_p0_7: dict = {
         "queue": [{"proposal_id": "prop_p0_001", "semantic_scope": "auth"}]
     }
@@ -575,8 +566,7 @@ with tempfile.TemporaryDirectory() as tmp21:
              "check_type": "pytest", "check_reference": "tests/test_auth.py"}
         ],
     }
-    with open(os.path.join(tmp21, "RFC_P0_21.json"), "w") as f:
-        json.dump(rfc_p0_6, f)
+    _write_json(os.path.join(tmp21, "RFC_P0_21.json"), rfc_p0_6)
     knowledge_p0_6: dict = {
         "queue": [{"proposal_id": "prop_p0_021", "branch": "feat/p0-test"}]
     }
@@ -600,13 +590,101 @@ with tempfile.TemporaryDirectory() as tmp21:
 print("\n=== Test 22: Full mode regression — existing checks unaffected ===")
 # Verify check_queue_budget with standard queue_max=15 (full mode default)
 knowledge_regression: dict = {
-    "queue": [{"status": "pending"} for _ in range(15)]
+    "queue": [_PENDING] * 15
 }
 result = check_queue_budget(knowledge_regression, 15)
 assert_true(result is not None, "Full mode regression — queue at 15/15 → still blocked")
-result_ok = check_queue_budget({"queue": [{"status": "pending"} for _ in range(14)]}, 15)
+result_ok = check_queue_budget({"queue": [_PENDING] * 14}, 15)
 assert_true(result_ok is None, "Full mode regression — queue at 14/15 → still passes")
 
+# ══════════════════════════════════════════════════════════════════
+# Test 23: get_modified_files — NUL-separated --raw records and HEAD OIDs
+# ══════════════════════════════════════════════════════════════════
+print("\n=== Test 23: get_modified_files — add, modify, delete, spaces ===")
+
+
+def _git(repo: str, *args: str) -> str:
+    return subprocess.run(
+        ["git", "-c", "user.name=skl", "-c", "user.email=skl@example.com",
+         *args],
+        cwd=repo, check=True, capture_output=True, text=True,
+    ).stdout.strip()
+
+
+repo_23 = tempfile.mkdtemp(prefix="skl_test_diff_")
+for name in ("keep.py", "mod.py", "gone.py"):
+    with open(os.path.join(repo_23, name), "w") as f:
+        f.write(f"# {name}\n")
+_git(repo_23, "init", "-q")
+_git(repo_23, "add", ".")
+_git(repo_23, "commit", "-q", "-m", "base")
+_git(repo_23, "branch", "base-23")
+with open(os.path.join(repo_23, "mod.py"), "a") as f:
+    f.write("x = 1\n")
+with open(os.path.join(repo_23, "new file.py"), "w") as f:
+    f.write("y = 2\n")
+os.remove(os.path.join(repo_23, "gone.py"))
+_git(repo_23, "add", "-A")
+_git(repo_23, "commit", "-q", "-m", "head")
+
+head_oids_23: dict = {}
+files_23 = get_modified_files(repo_23, "base-23", head_oids_23)
+assert_true(
+    sorted(files_23 or []) == ["gone.py", "mod.py", "new file.py"],
+    "--raw -z → added, modified, deleted and spaced paths, unchanged omitted",
+)
+assert_true(
+    head_oids_23.get("gone.py", "absent") is None,
+    "deleted path → all-zero HEAD OID mapped to None",
+)
+assert_true(
+    head_oids_23.get("mod.py") == _git(repo_23, "rev-parse", "HEAD:mod.py")
+    and head_oids_23.get("new file.py")
+    == _git(repo_23, "rev-parse", "HEAD:new file.py"),
+    "modified and added paths → their HEAD blob OIDs",
+)
+assert_true(
+    sorted(get_modified_files(repo_23, "base-23") or []) == sorted(files_23 or []),
+    "--name-only form → same paths as the --raw form",
+)
+assert_true(
+    get_modified_files(repo_23, "no-such-branch") is None,
+    "unknown base branch → None",
+)
+shutil.rmtree(repo_23, ignore_errors=True)
+
+# ══════════════════════════════════════════════════════════════════
+# Test 24: Check 2 — prefix matching edge cases
+# ══════════════════════════════════════════════════════════════════
+print("\n=== Test 24: Check 2 — nested, empty and duplicate prefixes ===")
+
+paths_24 = ["a/b/c.py", "a/x.py", "ab/x.py", "a", "x/y.py", "z.py"]
+
+
+def _flagged_24(scope_entry_24: dict) -> list:
+    v = check_semantic_scope(check_file_scope(paths_24, paths_24), scope_entry_24)
+    return sorted(p for p in paths_24 if v[p].cross_scope_flag)
+
+
+assert_true(
+    _flagged_24({"forbidden_path_prefixes": ["a/b/", "a/", "x/", "x/"]})
+    == ["a/b/c.py", "a/x.py", "x/y.py"],
+    "nested + duplicate forbidden prefixes → both levels flagged; "
+    "'ab/x.py' and bare 'a' not flagged",
+)
+assert_true(
+    _flagged_24({
+        "allowed_path_prefixes": ["a/b/"],
+        "forbidden_path_prefixes": ["a/"],
+    }) == ["a/x.py"],
+    "allowed a/b/ nested under forbidden a/ → only a/x.py flagged",
+)
+assert_true(
+    _flagged_24({"allowed_path_prefixes": [], "forbidden_path_prefixes": []})
+    == [],
+    "empty prefix lists → nothing flagged",
+)
+
 # ══════════════════════════════════════════════════════════════════# Summary
 # ════════════════════════════════════════════════════════════════════
 print()